@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Headless Benchmarks for the Event Handling, GUI and File I/O Demos
+CSC 242 - Object-Oriented Programming
+
+Each benchmark opens one demo class as a Toplevel of a single hidden Tk
+root and feeds it synthetic events with event_generate() at a controlled
+rate.  For every run it records:
+1. Handler latency (p50/p90/p99/max of each event_generate() call, which
+   runs the bound handlers synchronously)
+2. Frames dropped while the events were arriving (60 Hz budget)
+3. Canvas item counts, for demos that draw
+4. Resident memory (RSS) after the run
+
+Results are written as JSON so runs can be compared:
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py mouse keyboard --events 5000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/old.json
+
+With no DISPLAY set, an Xvfb virtual X server is started for the run, so
+no display hardware is needed (install it with: apt install xvfb).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+FRAME_MS = 1000 / 60
+
+
+# ============================================================================
+# VIRTUAL DISPLAY
+# ============================================================================
+
+def start_virtual_display():
+    """Start Xvfb and point DISPLAY at it, unless a display already exists
+    
+    Returns the Xvfb process (or None when a display was already set).
+    """
+    if os.environ.get("DISPLAY"):
+        return None
+    
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        sys.exit("No DISPLAY is set and Xvfb is not installed (apt install xvfb)")
+    
+    # Xvfb picks a free display number and writes it to the pipe
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        [xvfb, "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    
+    ready, _, _ = select.select([read_fd], [], [], 10)
+    number = os.read(read_fd, 16).decode().strip() if ready else ""
+    os.close(read_fd)
+    if not number:
+        process.kill()
+        sys.exit("Xvfb did not start")
+    
+    os.environ["DISPLAY"] = f":{number}"
+    return process
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+class FrameMonitor:
+    """Tick once per frame with after() and count the frames the loop missed"""
+    
+    def __init__(self, widget, frame_ms=FRAME_MS):
+        self.widget = widget
+        self.frame_ms = frame_ms
+        
+        self.dropped = 0
+        self.longest_gap = 0.0
+        self.last_tick = None
+        self.after_id = None
+    
+    def start(self):
+        self.last_tick = time.perf_counter()
+        self.after_id = self.widget.after(int(self.frame_ms), self.tick)
+    
+    def tick(self):
+        now = time.perf_counter()
+        gap_ms = (now - self.last_tick) * 1000
+        self.last_tick = now
+        
+        self.longest_gap = max(self.longest_gap, gap_ms)
+        self.dropped += max(0, int(gap_ms / self.frame_ms) - 1)
+        self.after_id = self.widget.after(int(self.frame_ms), self.tick)
+    
+    def stop(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, wall_seconds, monitor):
+    """Latency percentiles (in ms) and frame statistics for one run"""
+    values = sorted(latency * 1000 for latency in latencies)
+    return {
+        "events": len(values),
+        "wall_s": round(wall_seconds, 4),
+        "events_per_s": round(len(values) / wall_seconds, 1) if wall_seconds else 0.0,
+        "mean_ms": round(sum(values) / len(values), 4) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50), 4),
+        "p90_ms": round(percentile(values, 0.90), 4),
+        "p99_ms": round(percentile(values, 0.99), 4),
+        "max_ms": round(values[-1], 4) if values else 0.0,
+        "dropped_frames": monitor.dropped,
+        "longest_frame_ms": round(monitor.longest_gap, 2),
+    }
+
+
+def drive(widget, events, rate):
+    """Generate events on widget at about rate per second and time each one
+    
+    events is a list of (sequence, options) pairs for event_generate().
+    Several events are sent per timer tick when the rate is above what one
+    event per millisecond allows.  Returns the summary for the run.
+    """
+    interval = max(1, int(1000 / rate))
+    per_tick = max(1, round(rate * interval / 1000))
+    pending = iter(events)
+    latencies = []
+    monitor = FrameMonitor(widget)
+    
+    def tick():
+        for _ in range(per_tick):
+            event = next(pending, None)
+            if event is None:
+                widget.quit()
+                return
+            sequence, options = event
+            start = time.perf_counter()
+            widget.event_generate(sequence, **options)
+            latencies.append(time.perf_counter() - start)
+        widget.after(interval, tick)
+    
+    start = time.perf_counter()
+    monitor.start()
+    widget.after(0, tick)
+    widget.mainloop()
+    
+    # Let coalesced and idle work (log flushes, redraws) catch up
+    widget.update()
+    monitor.stop()
+    return summarize(latencies, time.perf_counter() - start, monitor)
+
+
+def wait_until(widget, condition, timeout=120):
+    """Run the event loop until condition() is true; returns seconds waited"""
+    start = time.perf_counter()
+    monitor = FrameMonitor(widget)
+    
+    def check():
+        if condition() or time.perf_counter() - start > timeout:
+            widget.quit()
+        else:
+            widget.after(5, check)
+    
+    monitor.start()
+    widget.after(0, check)
+    widget.mainloop()
+    monitor.stop()
+    return time.perf_counter() - start, monitor
+
+
+def rss_bytes():
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def settle(window):
+    """Map a demo window and process its startup events"""
+    window.deiconify()
+    window.update()
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def bench_mouse(root, options):
+    """Motion, drags and clicks on MouseEventDemo's canvas"""
+    from event_handling import MouseEventDemo
+    app = MouseEventDemo(root)
+    settle(app.root)
+    rng = random.Random(options.seed)
+    count = options.events
+    
+    def point():
+        return {"x": rng.randint(0, 579), "y": rng.randint(0, 349)}
+    
+    motion = [("<Motion>", point()) for _ in range(count)]
+    
+    drags = []
+    for _ in range(count // 50):
+        drags.append(("<ButtonPress-1>", point()))
+        drags += [("<Motion>", dict(point(), state=0x100)) for _ in range(48)]
+        drags.append(("<ButtonRelease-1>", dict(point(), state=0x100)))
+    
+    clicks = []
+    for _ in range(count // 4):
+        where = point()
+        clicks.append(("<ButtonPress-1>", where))
+        clicks.append(("<ButtonRelease-1>", dict(where, state=0x100)))
+    
+    results = {
+        "motion": drive(app.canvas, motion, options.rate),
+        "drag": drive(app.canvas, drags, options.rate),
+        "click": drive(app.canvas, clicks, options.rate),
+    }
+    return app, results
+
+
+def bench_keyboard(root, options):
+    """Typing into KeyboardEventDemo's entry and text area"""
+    from event_handling import KeyboardEventDemo
+    app = KeyboardEventDemo(root)
+    settle(app.root)
+    rng = random.Random(options.seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    
+    def typing(count):
+        events = []
+        for _ in range(count // 2):
+            keysym = rng.choice(letters)
+            events.append(("<KeyPress>", {"keysym": keysym}))
+            events.append(("<KeyRelease>", {"keysym": keysym}))
+        return events
+    
+    results = {}
+    for name, widget in (("entry", app.text_entry), ("text_area", app.text_area)):
+        widget.focus_force()
+        app.root.update()
+        results[name] = drive(widget, typing(options.events), options.rate)
+    return app, results
+
+
+def bench_window(root, options):
+    """A storm of Configure events on WindowEventDemo"""
+    from event_handling import WindowEventDemo
+    app = WindowEventDemo(root)
+    settle(app.root)
+    rng = random.Random(options.seed)
+    
+    resizes = [("<Configure>", {"width": rng.randint(400, 900), "height": rng.randint(300, 700),
+                                "x": rng.randint(0, 300), "y": rng.randint(0, 300)})
+               for _ in range(options.events)]
+    results = {"configure": drive(app.root, resizes, options.rate)}
+    return app, results
+
+
+def bench_custom(root, options):
+    """Custom and data-carrying virtual events on CustomEventDemo"""
+    from event_handling import CustomEventDemo
+    app = CustomEventDemo(root)
+    settle(app.root)
+    
+    custom = [("<<CustomEvent1>>", {}), ("<<CustomEvent2>>", {})] * (options.events // 2)
+    results = {"custom": drive(app.root, custom, options.rate)}
+    
+    # Data events carry a payload, so go through the demo's own trigger
+    latencies = []
+    monitor = FrameMonitor(app.root)
+    monitor.start()
+    start = time.perf_counter()
+    for _ in range(options.events // 10):
+        begin = time.perf_counter()
+        app.trigger_data_event()
+        latencies.append(time.perf_counter() - begin)
+        app.root.update()
+    monitor.stop()
+    results["data"] = summarize(latencies, time.perf_counter() - start, monitor)
+    return app, results
+
+
+def bench_advanced(root, options):
+    """Filling AdvancedGUIDemo's table with many records, then scrolling it"""
+    from gui_examples import AdvancedGUIDemo
+    app = AdvancedGUIDemo(root)
+    settle(app.root)
+    rng = random.Random(options.seed)
+    cities = ["Chicago", "New York", "Los Angeles", "Houston", "Phoenix"]
+    
+    records = [{"name": f"Person {i}", "age": rng.randint(18, 90),
+                "city": rng.choice(cities), "email": f"person{i}@email.com"}
+               for i in range(options.records)]
+    start = time.perf_counter()
+    app.data.add_many(records)
+    app.refresh_tree()
+    app.root.update()
+    load_seconds = time.perf_counter() - start
+    
+    scrolls = [("<Button-5>", {}) for _ in range(options.events // 2)]
+    scrolls += [("<Button-4>", {}) for _ in range(options.events // 2)]
+    results = {
+        "load": {"records": len(app.data), "wall_s": round(load_seconds, 4)},
+        "scroll": drive(app.tree, scrolls, options.rate),
+    }
+    return app, results
+
+
+def make_text_file(lines):
+    """A temporary text file with the given number of lines"""
+    file = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8")
+    with file:
+        for number in range(lines):
+            file.write(f"{number:08d} The quick brown fox jumps over the lazy dog.\n")
+    return file.name
+
+
+def bench_editor(app, text_widget, open_method, dialogs, options):
+    """Open a large file through an editor demo, then type into it"""
+    filename = make_text_file(options.lines)
+    original = dialogs.askopenfilename
+    dialogs.askopenfilename = lambda *args, **kwargs: filename
+    try:
+        open_method()
+        seconds, monitor = wait_until(app.root, lambda: app.loader is None)
+    finally:
+        dialogs.askopenfilename = original
+        os.unlink(filename)
+    
+    load = {
+        "lines": options.lines,
+        "wall_s": round(seconds, 4),
+        "dropped_frames": monitor.dropped,
+        "longest_frame_ms": round(monitor.longest_gap, 2),
+    }
+    
+    text_widget.focus_force()
+    app.root.update()
+    keys = [("<KeyPress>", {"keysym": random.Random(options.seed).choice("abcdef")})
+            for _ in range(options.events // 2)]
+    return {"load": load, "typing": drive(text_widget, keys, options.rate)}
+
+
+def bench_file_dialog(root, options):
+    """Loading a large file into FileDialogDemo and typing into it"""
+    import gui_examples
+    app = gui_examples.FileDialogDemo(root)
+    settle(app.root)
+    results = bench_editor(app, app.text_area, app.open_file, gui_examples.filedialog, options)
+    return app, results
+
+
+def bench_file_gui(root, options):
+    """Loading a large file into FileGUIIntegration and typing into it"""
+    import file_io_examples
+    app = file_io_examples.FileGUIIntegration(root)
+    settle(app.root)
+    results = bench_editor(app, app.text_editor, app.open_text_file,
+                           file_io_examples.filedialog, options)
+    return app, results
+
+
+BENCHMARKS = {
+    "mouse": bench_mouse,
+    "keyboard": bench_keyboard,
+    "window": bench_window,
+    "custom": bench_custom,
+    "advanced": bench_advanced,
+    "file_dialog": bench_file_dialog,
+    "file_gui": bench_file_gui,
+}
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def run_benchmark(root, name, options):
+    """Run one benchmark and tear its window down again"""
+    pending_before = set(root.tk.splitlist(root.tk.call("after", "info")))
+    
+    app, results = BENCHMARKS[name](root, options)
+    
+    canvas = getattr(app, "canvas", None)
+    if canvas is not None:
+        results["canvas_items"] = len(canvas.find_all())
+    results["rss_bytes"] = rss_bytes()
+    
+    app.root.destroy()
+    for after_id in root.tk.splitlist(root.tk.call("after", "info")):
+        if after_id not in pending_before:
+            root.after_cancel(after_id)
+    root.update()
+    return results
+
+
+def git_commit():
+    """The current commit, if this is a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_results, new_results):
+    """Print how each p99 latency changed since an earlier run"""
+    print("\nChange in p99 latency since the earlier run:")
+    for name, runs in new_results["benchmarks"].items():
+        old_runs = old_results.get("benchmarks", {}).get(name, {})
+        for run, stats in runs.items():
+            old_stats = old_runs.get(run)
+            if not isinstance(stats, dict) or not isinstance(old_stats, dict):
+                continue
+            if "p99_ms" in stats and old_stats.get("p99_ms"):
+                change = (stats["p99_ms"] - old_stats["p99_ms"]) / old_stats["p99_ms"] * 100
+                print(f"  {name}.{run}: {old_stats['p99_ms']:.3f} -> {stats['p99_ms']:.3f} ms ({change:+.0f}%)")
+
+
+def print_results(results):
+    """Print a one-line summary per timed run"""
+    for name, runs in results["benchmarks"].items():
+        for run, stats in runs.items():
+            if isinstance(stats, dict) and "p99_ms" in stats:
+                print(f"{name}.{run}: {stats['events']} events, p50 {stats['p50_ms']:.3f} ms, "
+                      f"p99 {stats['p99_ms']:.3f} ms, dropped frames {stats['dropped_frames']}")
+            elif isinstance(stats, dict):
+                print(f"{name}.{run}: {stats}")
+        print(f"{name}: rss {runs['rss_bytes'] / 1024 / 1024:.1f} MB"
+              + (f", canvas items {runs['canvas_items']}" if "canvas_items" in runs else ""))
+
+
+def main():
+    """Parse arguments, run the selected benchmarks and save the results"""
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the Tkinter demos")
+    parser.add_argument("benchmarks", nargs="*",
+                        help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--events", type=int, default=2000, help="events per run")
+    parser.add_argument("--rate", type=float, default=1000, help="events per second")
+    parser.add_argument("--records", type=int, default=100000, help="rows for the table benchmark")
+    parser.add_argument("--lines", type=int, default=200000, help="lines for the file load benchmarks")
+    parser.add_argument("--seed", type=int, default=242, help="random seed for event positions")
+    parser.add_argument("--output", help="where to write the JSON results")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    options = parser.parse_args()
+    
+    names = options.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+    xvfb = start_virtual_display()
+    
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        
+        results = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "tk": root.tk.call("info", "patchlevel"),
+            "platform": platform.platform(),
+            "options": {key: value for key, value in vars(options).items()
+                        if key not in ("benchmarks", "output", "compare")},
+            "benchmarks": {},
+        }
+        for name in names:
+            print(f"Running {name}...")
+            results["benchmarks"][name] = run_benchmark(root, name, options)
+        root.destroy()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+    
+    output = Path(options.output) if options.output else (
+        REPO_DIR / "benchmarks" / "results" / f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    
+    print()
+    print_results(results)
+    print(f"\nResults written to {output}")
+    
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,13 +15,15 @@ import tkinter as tk
 from tkinter import messagebox, Canvas
 import time
 import threading
+from gui_helpers import (CanvasScene, DemoHost, EventBus, EventChain, EventLog, MotionCoalescer,
+                         ResizeCoalescer, TimerWheel, WindowGeometry)
 
 
 class MouseEventDemo:
     """Comprehensive demonstration of mouse event handling"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Mouse Event Handling Demo")
         self.root.geometry("600x500")
         
@@ -51,6 +53,9 @@ class MouseEventDemo:
         self.canvas = Canvas(self.root, bg="white", width=580, height=350)
         self.canvas.pack(padx=10, pady=10)
         
+        # Index drawn shapes and cap how many stay on the canvas
+        self.scene = CanvasScene(self.canvas, max_items=2000)
+        
         # Mouse position display
         self.position_label = tk.Label(self.root, text="Mouse position: (0, 0)")
         self.position_label.pack()
@@ -74,6 +79,7 @@ class MouseEventDemo:
                                 font=("Courier", 9))
         self.event_log.pack(side="left", fill="both", expand=True)
         scrollbar.config(command=self.event_log.yview)
+        self.log = EventLog(self.event_log)
         
         # Control buttons
         control_frame = tk.Frame(self.root)
@@ -111,6 +117,11 @@ class MouseEventDemo:
         self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
         self.canvas.bind("<Button-4>", self.on_mouse_wheel_up)    # Linux
         self.canvas.bind("<Button-5>", self.on_mouse_wheel_down)  # Linux
+        
+        # Motion events arrive faster than the screen refreshes, so only
+        # the newest sample is applied once per frame
+        self.motion_coalescer = MotionCoalescer(self.canvas, self.update_mouse_position)
+        self.drag_coalescer = MotionCoalescer(self.canvas, self.update_drag_line)
     
     def log_event(self, event_type, details=""):
         """Log event to the text area"""
@@ -119,8 +130,7 @@ class MouseEventDemo:
         if details:
             message += f": {details}"
         
-        self.event_log.insert(tk.END, f"{message}\n")
-        self.event_log.see(tk.END)
+        self.log.write(message)
     
     def on_left_click(self, event):
         """Handle left mouse button click"""
@@ -128,9 +138,9 @@ class MouseEventDemo:
         
         # Draw a circle at click position
         radius = 10
-        self.canvas.create_oval(event.x - radius, event.y - radius,
-                               event.x + radius, event.y + radius,
-                               fill="red", outline="darkred", width=2)
+        self.scene.create("oval", event.x - radius, event.y - radius,
+                         event.x + radius, event.y + radius,
+                         fill="red", outline="darkred", width=2)
     
     def on_middle_click(self, event):
         """Handle middle mouse button click"""
@@ -143,29 +153,29 @@ class MouseEventDemo:
         
         # Draw a rectangle at click position
         size = 20
-        self.canvas.create_rectangle(event.x - size//2, event.y - size//2,
-                                   event.x + size//2, event.y + size//2,
-                                   fill="blue", outline="darkblue", width=2)
+        self.scene.create("rectangle", event.x - size//2, event.y - size//2,
+                        event.x + size//2, event.y + size//2,
+                        fill="blue", outline="darkblue", width=2)
     
     def on_double_click(self, event):
         """Handle double click"""
         self.log_event("Double Click", f"({event.x}, {event.y})")
         
         # Add text at double-click position
-        self.canvas.create_text(event.x, event.y,
-                               text="Double!",
-                               fill="green",
-                               font=("Arial", 12, "bold"))
+        self.scene.create("text", event.x, event.y,
+                         text="Double!",
+                         fill="green",
+                         font=("Arial", 12, "bold"))
     
     def on_triple_click(self, event):
         """Handle triple click"""
         self.log_event("Triple Click", f"({event.x}, {event.y})")
         
         # Add special text for triple click
-        self.canvas.create_text(event.x, event.y,
-                               text="TRIPLE!",
-                               fill="purple",
-                               font=("Arial", 16, "bold"))
+        self.scene.create("text", event.x, event.y,
+                         text="TRIPLE!",
+                         fill="purple",
+                         font=("Arial", 16, "bold"))
     
     def on_button_press(self, event):
         """Handle mouse button press"""
@@ -175,6 +185,7 @@ class MouseEventDemo:
     
     def on_button_release(self, event):
         """Handle mouse button release"""
+        self.drag_coalescer.flush()
         self.mouse_pressed = False
         self.log_event("Button Release", f"({event.x}, {event.y})")
         
@@ -182,27 +193,44 @@ class MouseEventDemo:
             start_x, start_y = self.drag_start
             distance = ((event.x - start_x)**2 + (event.y - start_y)**2)**0.5
             if distance > 5:  # Only log significant drags
+                # Region query on the scene's grid instead of find_overlapping
+                crossed = [item for item in self.scene.find_in_region(start_x, start_y, event.x, event.y)
+                           if item != self.current_shape]
                 self.log_event("Drag Complete", 
-                              f"From ({start_x}, {start_y}) to ({event.x}, {event.y}), distance: {distance:.1f}")
+                              f"From ({start_x}, {start_y}) to ({event.x}, {event.y}), "
+                              f"distance: {distance:.1f}, {len(crossed)} shapes in the box")
     
     def on_mouse_motion(self, event):
         """Handle mouse movement"""
-        # Update position display (don't log every movement to avoid spam)
-        self.position_label.config(text=f"Mouse position: ({event.x}, {event.y})")
+        # Don't log every movement to avoid spam
+        self.motion_coalescer.submit(event)
+    
+    def update_mouse_position(self, event):
+        """Update position display with the newest motion sample"""
+        text = f"Mouse position: ({event.x}, {event.y})"
+        item = self.scene.find_at(event.x, event.y)
+        if item is not None:
+            text += f" over {self.canvas.type(item)}"
+        self.position_label.config(text=text)
     
     def on_drag_motion(self, event):
         """Handle mouse drag (button held down while moving)"""
+        self.drag_coalescer.submit(event)
+    
+    def update_drag_line(self, event):
+        """Stretch the rubber-band line to the newest drag sample"""
         if self.drag_start:
             # Draw line from drag start to current position
             start_x, start_y = self.drag_start
             
-            # Remove previous drag line if it exists
             if self.current_shape:
-                self.canvas.delete(self.current_shape)
-            
-            # Draw new line
-            self.current_shape = self.canvas.create_line(start_x, start_y, event.x, event.y,
-                                                        fill="orange", width=3)
+                # Move the existing line instead of recreating it
+                self.scene.coords(self.current_shape, start_x, start_y, event.x, event.y)
+            else:
+                self.current_shape = self.scene.create("line", start_x, start_y, event.x, event.y,
+                                                      fill="orange", width=3)
+                # The rubber band is reused by every drag, so it must not be evicted
+                self.scene.pin(self.current_shape)
     
     def on_mouse_enter(self, event):
         """Handle mouse entering canvas"""
@@ -238,12 +266,12 @@ class MouseEventDemo:
     
     def clear_canvas(self):
         """Clear the canvas"""
-        self.canvas.delete("all")
+        self.scene.clear()
         self.current_shape = None
     
     def clear_log(self):
         """Clear the event log"""
-        self.event_log.delete("1.0", tk.END)
+        self.log.clear()
     
     def run(self):
         self.root.mainloop()
@@ -252,8 +280,8 @@ class MouseEventDemo:
 class KeyboardEventDemo:
     """Demonstration of keyboard event handling"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Keyboard Event Handling Demo")
         self.root.geometry("600x500")
         
@@ -321,6 +349,7 @@ class KeyboardEventDemo:
                                 font=("Courier", 9))
         self.event_log.pack(side="left", fill="both", expand=True)
         scrollbar.config(command=self.event_log.yview)
+        self.log = EventLog(self.event_log)
         
         # Control buttons
         control_frame = tk.Frame(self.root)
@@ -386,8 +415,7 @@ class KeyboardEventDemo:
         if details:
             message += f": {details}"
         
-        self.event_log.insert(tk.END, f"{message}\n")
-        self.event_log.see(tk.END)
+        self.log.write(message)
     
     def update_key_state_display(self):
         """Update the key state display"""
@@ -496,7 +524,7 @@ class KeyboardEventDemo:
         """Handle Alt+F4"""
         self.log_event("Alt+F4", "Close window command")
         if messagebox.askokcancel("Quit", "Close the application?"):
-            self.root.quit()
+            self.root.destroy()
     
     def on_entry_key_press(self, event):
         """Handle key press in entry widget"""
@@ -530,7 +558,7 @@ class KeyboardEventDemo:
     
     def clear_log(self):
         """Clear the event log"""
-        self.event_log.delete("1.0", tk.END)
+        self.log.clear()
     
     def run(self):
         self.root.mainloop()
@@ -539,8 +567,8 @@ class KeyboardEventDemo:
 class WindowEventDemo:
     """Demonstration of window and application events"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Window Event Handling Demo")
         self.root.geometry("500x400")
         
@@ -549,7 +577,6 @@ class WindowEventDemo:
         
         # Track window state
         self.window_state = "normal"
-        self.last_size = (500, 400)
     
     def setup_widgets(self):
         # Instructions
@@ -610,14 +637,18 @@ class WindowEventDemo:
                                 font=("Courier", 9))
         self.event_log.pack(side="left", fill="both", expand=True)
         scrollbar.config(command=self.event_log.yview)
+        self.log = EventLog(self.event_log)
         
         tk.Button(self.root, text="Clear Log", 
                  command=self.clear_log).pack(pady=5)
     
     def bind_window_events(self):
         """Bind window-related events"""
-        # Window configuration changes (resize, move)
-        self.root.bind("<Configure>", self.on_window_configure)
+        # Window configuration changes: a drag-resize sends hundreds of these,
+        # so log a live preview a few times a second and the final size once
+        self.resizer = ResizeCoalescer(self.root, self.on_window_resized,
+                                       on_preview=self.on_window_configure,
+                                       preview_interval=250)
         
         # Window state changes
         self.root.bind("<Map>", self.on_window_map)
@@ -638,8 +669,9 @@ class WindowEventDemo:
         self.root.bind("<Map>", self.on_map_event)
         self.root.bind("<Unmap>", self.on_unmap_event)
         
-        # Update display periodically
-        self.update_window_info()
+        # Keep the info display current from the events above; no polling
+        self.geometry = WindowGeometry(self.root)
+        self.geometry.subscribe(self.update_window_info)
     
     def log_event(self, event_type, details=""):
         """Log window event"""
@@ -648,48 +680,28 @@ class WindowEventDemo:
         if details:
             message += f": {details}"
         
-        self.event_log.insert(tk.END, f"{message}\n")
-        self.event_log.see(tk.END)
+        self.log.write(message)
     
-    def update_window_info(self):
-        """Update window information display"""
-        try:
-            # Get window geometry
-            geometry = self.root.geometry()
-            width, height, x, y = map(int, geometry.split('+')[0].split('x') + geometry.split('+')[1:])
-            
+    def update_window_info(self, geometry, changed):
+        """Update only the parts of the information display that changed"""
+        if "size" in changed:
+            width, height = geometry.size
             self.size_label.config(text=f"Size: {width}x{height}")
+        if "position" in changed:
+            x, y = geometry.position
             self.position_label.config(text=f"Position: ({x}, {y})")
-            
-            # Get window state
-            state = self.root.state()
-            self.state_label.config(text=f"State: {state}")
-            
-            # Check focus
-            focus_widget = self.root.focus_get()
-            has_focus = focus_widget is not None
-            self.focus_label.config(text=f"Focus: {'Yes' if has_focus else 'No'}")
-            
-        except Exception as e:
-            pass  # Ignore errors during updates
-        
-        # Schedule next update
-        self.root.after(1000, self.update_window_info)
+        if "state" in changed:
+            self.state_label.config(text=f"State: {geometry.state}")
+        if "focused" in changed:
+            self.focus_label.config(text=f"Focus: {'Yes' if geometry.focused else 'No'}")
     
-    def on_window_configure(self, event):
-        """Handle window configuration changes"""
-        if event.widget == self.root:  # Only handle root window events
-            width = event.width
-            height = event.height
-            
-            # Check if this is a resize event
-            if (width, height) != self.last_size:
-                self.log_event("Window Resize", f"New size: {width}x{height}")
-                self.last_size = (width, height)
-            
-            # Log other configuration details
-            details = f"width={width}, height={height}, x={event.x}, y={event.y}"
-            self.log_event("Window Configure", details)
+    def on_window_configure(self, width, height):
+        """Handle window configuration changes while a resize is in progress"""
+        self.log_event("Window Configure", f"width={width}, height={height}")
+    
+    def on_window_resized(self, width, height):
+        """Handle the window settling at a new size"""
+        self.log_event("Window Resize", f"New size: {width}x{height}")
     
     def on_window_map(self, event):
         """Handle window mapping (becoming visible)"""
@@ -790,7 +802,7 @@ class WindowEventDemo:
     
     def clear_log(self):
         """Clear the event log"""
-        self.event_log.delete("1.0", tk.END)
+        self.log.clear()
     
     def run(self):
         self.root.mainloop()
@@ -799,8 +811,8 @@ class WindowEventDemo:
 class CustomEventDemo:
     """Demonstration of custom event creation and handling"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Custom Event Handling Demo")
         self.root.geometry("600x500")
         
@@ -835,6 +847,8 @@ class CustomEventDemo:
                  command=self.trigger_custom_event_2).pack(side="left", padx=5)
         tk.Button(button_frame1, text="Trigger Data Event", 
                  command=self.trigger_data_event).pack(side="left", padx=5)
+        tk.Button(button_frame1, text="Data Burst (Thread)", 
+                 command=self.trigger_data_burst).pack(side="left", padx=5)
         
         button_frame2 = tk.Frame(trigger_frame)
         button_frame2.pack(fill="x", pady=5)
@@ -845,6 +859,8 @@ class CustomEventDemo:
                  command=self.stop_timer_events).pack(side="left", padx=5)
         tk.Button(button_frame2, text="Trigger Chain Event", 
                  command=self.trigger_chain_event).pack(side="left", padx=5)
+        tk.Button(button_frame2, text="Cancel Chain", 
+                 command=self.cancel_chain_event).pack(side="left", padx=5)
         
         # Event status display
         status_frame = tk.LabelFrame(self.root, text="Event Status", padx=10, pady=10)
@@ -862,6 +878,7 @@ class CustomEventDemo:
         # Canvas for visual event feedback
         self.canvas = tk.Canvas(self.root, height=150, bg="white")
         self.canvas.pack(fill="x", padx=10, pady=10)
+        self.scene = CanvasScene(self.canvas, max_items=500)
         
         # Event log
         log_frame = tk.Frame(self.root)
@@ -880,6 +897,7 @@ class CustomEventDemo:
                                 font=("Courier", 9))
         self.event_log.pack(side="left", fill="both", expand=True)
         scrollbar.config(command=self.event_log.yview)
+        self.log = EventLog(self.event_log)
         
         tk.Button(self.root, text="Clear Log", 
                  command=self.clear_log).pack(pady=5)
@@ -889,11 +907,29 @@ class CustomEventDemo:
         # Bind custom virtual events
         self.root.bind("<<CustomEvent1>>", self.on_custom_event_1)
         self.root.bind("<<CustomEvent2>>", self.on_custom_event_2)
-        self.root.bind("<<DataEvent>>", self.on_data_event)
         self.root.bind("<<TimerEvent>>", self.on_timer_event)
         self.root.bind("<<ChainEvent>>", self.on_chain_event)
         self.root.bind("<<ChainEvent2>>", self.on_chain_event_2)
         self.root.bind("<<ChainEvent3>>", self.on_chain_event_3)
+        
+        # Events that carry data go through the bus, which queues each
+        # payload so none are lost and worker threads can post too
+        self.bus = EventBus(self.root)
+        self.bus.register("<<DataEvent>>", dict)
+        self.bus.subscribe("<<DataEvent>>", self.on_data_event)
+        
+        # All of this demo's timers share one after() callback
+        self.timers = TimerWheel(self.root)
+        self.timer_handle = None
+        
+        # The chain is declared once: each stage waits on the wheel and then
+        # generates its event, and the last event shares a stage with the label
+        self.chain = EventChain(self.timers, on_complete=self.on_chain_complete,
+                                on_cancel=self.on_chain_cancelled)
+        self.chain.step("<<ChainEvent>>")
+        self.chain.step("<<ChainEvent2>>", delay=500)
+        self.chain.step("<<ChainEvent3>>", self.show_chain_complete, delay=500)
+        self.chain.step(self.clear_chain_items, delay=2000, name="Clear label")
     
     def log_event(self, event_type, details=""):
         """Log custom event"""
@@ -902,8 +938,7 @@ class CustomEventDemo:
         if details:
             message += f": {details}"
         
-        self.event_log.insert(tk.END, f"{message}\n")
-        self.event_log.see(tk.END)
+        self.log.write(message)
         
         # Update status
         self.last_event_label.config(text=f"Last event: {event_type}")
@@ -927,40 +962,56 @@ class CustomEventDemo:
             "source": "manual_trigger"
         }
         
-        # Store data for event handler to access
-        self.root.custom_event_data = data
-        self.root.event_generate("<<DataEvent>>")
+        # The bus delivers the data with the event
+        self.bus.post("<<DataEvent>>", data)
         self.log_event("Data Event Triggered", f"With data: {data}")
     
+    def trigger_data_burst(self, count=1000):
+        """Post a burst of data events from a worker thread"""
+        def produce():
+            import random
+            for _ in range(count):
+                self.bus.post("<<DataEvent>>", {
+                    "value": random.randint(1, 100),
+                    "timestamp": time.time(),
+                    "source": "worker_thread"
+                })
+        
+        threading.Thread(target=produce, daemon=True).start()
+        self.log_event("Data Burst Started", f"Posting {count} data events from a worker thread")
+    
     def start_timer_events(self):
         """Start generating timer events"""
         if not self.timer_active:
             self.timer_active = True
             self.timer_status_label.config(text="Timer events: Running")
-            self.schedule_timer_event()
+            self.timer_handle = self.timers.call_every(2000, self.generate_timer_event)
             self.log_event("Timer Events Started", "Will fire every 2 seconds")
     
     def stop_timer_events(self):
         """Stop generating timer events"""
         self.timer_active = False
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
+            self.timer_handle = None
         self.timer_status_label.config(text="Timer events: Stopped")
         self.log_event("Timer Events Stopped", "No more timer events")
     
-    def schedule_timer_event(self):
-        """Schedule the next timer event"""
-        if self.timer_active:
-            self.root.after(2000, self.generate_timer_event)
-    
     def generate_timer_event(self):
         """Generate a timer event"""
-        if self.timer_active:
-            self.root.event_generate("<<TimerEvent>>")
-            self.schedule_timer_event()
+        self.root.event_generate("<<TimerEvent>>")
     
     def trigger_chain_event(self):
         """Trigger a chain of events"""
-        self.root.event_generate("<<ChainEvent>>")
-        self.log_event("Chain Event Started", "Will trigger sequence of events")
+        restarted = self.chain.running()
+        self.chain.start()
+        self.log_event("Chain Event Started", "Restarted from the first stage" if restarted
+                       else "Will trigger sequence of events")
+    
+    def cancel_chain_event(self):
+        """Stop the chain before its next stage"""
+        if not self.chain.cancel():
+            self.log_event("Chain Not Running", "Nothing to cancel")
     
     def on_custom_event_1(self, event):
         """Handle first custom event"""
@@ -971,8 +1022,8 @@ class CustomEventDemo:
         import random
         x = random.randint(50, 550)
         y = random.randint(20, 130)
-        self.canvas.create_oval(x-10, y-10, x+10, y+10, 
-                               fill="red", outline="darkred")
+        self.scene.create("oval", x-10, y-10, x+10, y+10, 
+                         fill="red", outline="darkred")
         
         self.log_event("Custom Event 1 Handled", f"Drew red circle at ({x}, {y})")
     
@@ -985,18 +1036,17 @@ class CustomEventDemo:
         import random
         x = random.randint(50, 550)
         y = random.randint(20, 130)
-        self.canvas.create_rectangle(x-15, y-10, x+15, y+10, 
-                                   fill="blue", outline="darkblue")
+        self.scene.create("rectangle", x-15, y-10, x+15, y+10, 
+                        fill="blue", outline="darkblue")
         
         self.log_event("Custom Event 2 Handled", f"Drew blue rectangle at ({x}, {y})")
     
-    def on_data_event(self, event):
+    def on_data_event(self, data):
         """Handle event with associated data"""
         self.custom_event_counter += 1
         self.event_counter_label.config(text=f"Custom events triggered: {self.custom_event_counter}")
         
-        # Access custom data
-        data = getattr(self.root, 'custom_event_data', {})
+        # The bus passes the payload that was posted with this event
         value = data.get('value', 0)
         source = data.get('source', 'unknown')
         
@@ -1005,8 +1055,8 @@ class CustomEventDemo:
         y = 75
         color = "green" if value > 50 else "orange"
         
-        self.canvas.create_text(x, y, text=str(value), 
-                               fill=color, font=("Arial", 14, "bold"))
+        self.scene.create("text", x, y, text=str(value), 
+                         fill=color, font=("Arial", 14, "bold"))
         
         self.log_event("Data Event Handled", f"Value: {value}, Source: {source}, Position: ({x:.0f}, {y})")
     
@@ -1021,43 +1071,50 @@ class CustomEventDemo:
         y = random.randint(20, 130)
         
         # Create a temporary dot that fades
-        dot = self.canvas.create_oval(x-5, y-5, x+5, y+5, 
-                                     fill="purple", outline="darkviolet")
+        dot = self.scene.create("oval", x-5, y-5, x+5, y+5, 
+                               fill="purple", outline="darkviolet")
         
         # Remove dot after 1 second
-        self.root.after(1000, lambda: self.canvas.delete(dot))
+        self.timers.call_later(1000, self.scene.delete, dot)
         
         self.log_event("Timer Event Handled", f"Temporary purple dot at ({x}, {y})")
     
     def on_chain_event(self, event):
         """Handle first event in chain"""
-        self.log_event("Chain Event 1 Handled", "Triggering next event in chain")
-        
-        # Trigger next event in chain after delay
-        self.root.after(500, lambda: self.root.event_generate("<<ChainEvent2>>"))
+        self.log_event("Chain Event 1 Handled", "Next event in chain follows in 500 ms")
     
     def on_chain_event_2(self, event):
         """Handle second event in chain"""
-        self.log_event("Chain Event 2 Handled", "Triggering final event in chain")
-        
-        # Trigger final event in chain
-        self.root.after(500, lambda: self.root.event_generate("<<ChainEvent3>>"))
+        self.log_event("Chain Event 2 Handled", "Final event in chain follows in 500 ms")
     
     def on_chain_event_3(self, event):
         """Handle final event in chain"""
         self.log_event("Chain Event 3 Handled", "Chain complete!")
-        
-        # Visual indication of chain completion
-        self.canvas.create_text(300, 75, text="CHAIN COMPLETE!", 
-                               fill="red", font=("Arial", 16, "bold"))
-        
-        # Clear text after 2 seconds
-        self.root.after(2000, lambda: self.canvas.delete("all"))
+    
+    def show_chain_complete(self):
+        """Visual indication of chain completion, shown with the last event"""
+        self.scene.create("text", 300, 75, text="CHAIN COMPLETE!", 
+                         fill="red", font=("Arial", 16, "bold"), tags="chain")
+    
+    def clear_chain_items(self):
+        """Remove what the chain drew, leaving the other shapes alone"""
+        self.scene.delete_tag("chain")
+    
+    def on_chain_complete(self, chain):
+        """Log how long each stage of the finished chain took"""
+        for line in chain.report():
+            self.log_event("Chain Stage", line)
+    
+    def on_chain_cancelled(self, chain):
+        """Log where the chain was stopped and tidy the canvas"""
+        name, delay, steps = chain.stages[chain.index]
+        self.clear_chain_items()
+        self.log_event("Chain Cancelled", f"Stopped before stage {chain.index + 1} ({name})")
     
     def clear_log(self):
         """Clear the event log"""
-        self.event_log.delete("1.0", tk.END)
-        self.canvas.delete("all")
+        self.log.clear()
+        self.scene.clear()
     
     def run(self):
         self.root.mainloop()
@@ -1075,33 +1132,25 @@ def main():
     
     choice = input("\nEnter your choice (1-5): ").strip()
     
-    if choice == "1":
-        app = MouseEventDemo()
-        app.run()
-    elif choice == "2":
-        app = KeyboardEventDemo()
-        app.run()
-    elif choice == "3":
-        app = WindowEventDemo()
-        app.run()
-    elif choice == "4":
-        app = CustomEventDemo()
-        app.run()
+    demos = [
+        ("Mouse Events", MouseEventDemo),
+        ("Keyboard Events", KeyboardEventDemo),
+        ("Window Events", WindowEventDemo),
+        ("Custom Events", CustomEventDemo)
+    ]
+    
+    if choice in ("1", "2", "3", "4"):
+        selected = [demos[int(choice) - 1]]
     elif choice == "5":
-        # Run demos sequentially
-        demos = [
-            ("Mouse Events", MouseEventDemo),
-            ("Keyboard Events", KeyboardEventDemo),
-            ("Window Events", WindowEventDemo),
-            ("Custom Events", CustomEventDemo)
-        ]
-        
-        for name, demo_class in demos:
-            print(f"\nRunning {name} demo...")
-            app = demo_class()
-            app.run()
+        # Run demos sequentially, all in one Tk interpreter
+        selected = demos
     else:
         print("Invalid choice. Please run the script again.")
+        return
+    
+    host = DemoHost("Event Handling Demonstrations")
+    host.run(selected)
+    host.print_startup_times()
 
 
 if __name__ == "__main__":
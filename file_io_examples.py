@@ -20,7 +20,8 @@ import tempfile
 from pathlib import Path
 from datetime import datetime
 import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
+from gui_helpers import AsyncFileLoader, DemoHost, LargeFileView, save_text_atomically
 
 
 class BasicFileOperations:
@@ -851,15 +852,20 @@ class FileSystemOperations:
 class FileGUIIntegration:
     """Demonstrates file operations integrated with GUI"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("File Operations GUI Demo")
         self.root.geometry("700x600")
         
         self.current_file = None
         self.file_content = ""
+        self.loader = None
+        self.large_view = None
         
         self.setup_widgets()
+        
+        # Stop the loader thread and release a mapped file with the window
+        self.root.bind("<Destroy>", self.on_destroy, add="+")
     
     def setup_widgets(self):
         """Setup GUI widgets"""
@@ -873,11 +879,13 @@ class FileGUIIntegration:
         file_menu.add_command(label="Open Text File", command=self.open_text_file)
         file_menu.add_command(label="Open CSV File", command=self.open_csv_file)
         file_menu.add_command(label="Open JSON File", command=self.open_json_file)
+        file_menu.add_command(label="Open Large File (Read-Only)", command=self.open_large_file)
+        file_menu.add_command(label="Go to Line", command=self.go_to_line)
         file_menu.add_separator()
         file_menu.add_command(label="Save", command=self.save_file)
         file_menu.add_command(label="Save As", command=self.save_as_file)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.root.destroy)
         
         # Toolbar
         toolbar = tk.Frame(self.root, relief="raised", borderwidth=1)
@@ -907,23 +915,35 @@ class FileGUIIntegration:
                                                     font=("Courier", 11))
         self.text_editor.pack(fill="both", expand=True, padx=5, pady=5)
         
-        # Bind text change events
-        self.text_editor.bind("<KeyPress>", self.on_text_change)
+        # Bind text change events; Tk fires <<Modified>> only when the
+        # flag flips, not on every keystroke
+        self.text_editor.bind("<<Modified>>", self.on_text_change)
         
         # Status bar
         self.status_bar = tk.Label(self.root, text="Ready", relief="sunken", anchor="w")
         self.status_bar.pack(fill="x", side="bottom")
         
+        # Progress bar and cancel button, shown only while a file loads
+        self.load_frame = tk.Frame(self.root)
+        self.load_progress = ttk.Progressbar(self.load_frame, mode="determinate", maximum=100)
+        self.load_progress.pack(side="left", fill="x", expand=True, padx=5, pady=2)
+        tk.Button(self.load_frame, text="Cancel", command=self.cancel_loading).pack(side="right", padx=5)
+        
         # Track if file has been modified
         self.is_modified = False
+        
+        # Size and timestamp of the current file, read on open and save only
+        self.file_stat = None
     
     def new_file(self):
         """Create a new file"""
         if self.check_save_changes():
+            self.stop_loader()
+            self.close_large_view()
             self.text_editor.delete("1.0", tk.END)
             self.current_file = None
-            self.is_modified = False
-            self.update_file_info()
+            self.refresh_file_stat()
+            self.set_modified(False)
             self.status_bar.config(text="New file created")
     
     def open_text_file(self):
@@ -941,19 +961,142 @@ class FileGUIIntegration:
         )
         
         if file_path:
+            self.stop_loader()
+            self.close_large_view()
+            self.text_editor.delete("1.0", tk.END)
+            self.current_file = None
+            self.refresh_file_stat()
+            self.set_modified(False)
+            
+            # Read on a worker thread so large files don't freeze the window
+            self.loader = AsyncFileLoader(self.root, file_path,
+                                          on_chunk=self.on_load_chunk,
+                                          on_progress=self.on_load_progress,
+                                          on_done=lambda: self.on_load_done(file_path),
+                                          on_error=self.on_load_error)
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                
-                self.text_editor.delete("1.0", tk.END)
-                self.text_editor.insert("1.0", content)
-                
-                self.current_file = file_path
-                self.is_modified = False
-                self.update_file_info()
-                self.status_bar.config(text=f"Opened: {Path(file_path).name}")
+                self.loader.start()
+            except Exception as e:
+                self.loader = None
+                messagebox.showerror("Error", f"Could not open file:\n{e}")
+                return
+            
+            # Typing into a half-loaded file would be saved or lost unnoticed
+            self.text_editor.config(state="disabled")
+            self.load_progress.config(value=0)
+            self.load_frame.pack(fill="x", side="bottom", after=self.status_bar)
+            self.status_bar.config(text=f"Opening: {Path(file_path).name}...")
+    
+    def on_load_chunk(self, chunk):
+        """Append the next chunk of a file that is loading"""
+        self.text_editor.config(state="normal")
+        self.text_editor.insert(tk.END, chunk)
+        self.text_editor.config(state="disabled")
+    
+    def on_load_progress(self, bytes_read, total_bytes):
+        """Show how much of the file has been read"""
+        if total_bytes:
+            self.load_progress.config(value=100 * bytes_read / total_bytes)
+    
+    def on_load_done(self, file_path):
+        """Finish opening a file once every chunk has arrived"""
+        self.stop_loader()
+        self.text_editor.mark_set(tk.INSERT, "1.0")
+        self.text_editor.see("1.0")
+        
+        self.current_file = file_path
+        self.refresh_file_stat()
+        self.set_modified(False)
+        self.status_bar.config(text=f"Opened: {Path(file_path).name}")
+    
+    def on_load_error(self, error):
+        """Abandon a load that failed part way through"""
+        self.stop_loader()
+        self.text_editor.delete("1.0", tk.END)
+        self.set_modified(False)
+        self.status_bar.config(text="Ready")
+        messagebox.showerror("Error", f"Could not open file:\n{error}")
+    
+    def cancel_loading(self):
+        """Cancel a load in progress and discard the partial text"""
+        if self.loader:
+            self.stop_loader()
+            self.text_editor.delete("1.0", tk.END)
+            self.set_modified(False)
+            self.status_bar.config(text="Open cancelled")
+    
+    def stop_loader(self):
+        """Stop any running loader and hide the progress bar"""
+        if self.loader:
+            self.loader.cancel()
+            self.loader = None
+            self.text_editor.config(state="normal")  # Disabled while loading
+        self.load_frame.pack_forget()
+    
+    def open_large_file(self):
+        """Open a file too big to edit in a read-only, memory-mapped view"""
+        if not self.check_save_changes():
+            return
+        
+        file_path = filedialog.askopenfilename(
+            title="Open Large File (Read-Only)",
+            filetypes=[
+                ("Text files", "*.txt *.log"),
+                ("All files", "*.*")
+            ]
+        )
+        
+        if file_path:
+            self.stop_loader()
+            self.close_large_view()
+            try:
+                self.large_view = LargeFileView(self.text_editor, self.text_editor.vbar, file_path,
+                                                on_indexed=self.on_large_file_indexed)
             except Exception as e:
                 messagebox.showerror("Error", f"Could not open file:\n{e}")
+                return
+            
+            self.current_file = file_path
+            self.refresh_file_stat()
+            self.set_modified(False)
+    
+    def on_large_file_indexed(self, bytes_indexed, total_bytes):
+        """Report progress while the large file's line index is built"""
+        name = Path(self.current_file).name if self.current_file else ""
+        if bytes_indexed < total_bytes:
+            percent = 100 * bytes_indexed // total_bytes
+            self.status_bar.config(text=f"Indexing {name}: {percent}%")
+        else:
+            lines = self.large_view.line_count()
+            self.status_bar.config(text=f"Opened read-only: {name} ({lines:,} lines)")
+    
+    def close_large_view(self):
+        """Leave large file mode and make the editor editable again"""
+        if self.large_view:
+            self.large_view.close()
+            self.large_view = None
+            self.current_file = None
+            self.file_stat = None
+    
+    def on_destroy(self, event):
+        """Release the file being loaded or viewed when the window closes"""
+        if event.widget is self.root:  # Not one of its children
+            if self.loader:
+                self.loader.cancel()
+                self.loader = None
+            self.close_large_view()
+    
+    def go_to_line(self):
+        """Jump to a line number"""
+        line = simpledialog.askinteger("Go to Line", "Line number:",
+                                       parent=self.root, minvalue=1)
+        if line:
+            if self.large_view:
+                self.large_view.go_to_line(line)
+            else:
+                self.text_editor.mark_set(tk.INSERT, f"{line}.0")
+                self.text_editor.see(tk.INSERT)
+            self.status_bar.config(text=f"Line: {line}")
     
     def open_csv_file(self):
         """Open and display CSV file"""
@@ -963,6 +1106,8 @@ class FileGUIIntegration:
         )
         
         if file_path:
+            self.stop_loader()
+            self.close_large_view()
             try:
                 content = []
                 with open(file_path, 'r', encoding='utf-8') as file:
@@ -976,6 +1121,9 @@ class FileGUIIntegration:
                 self.text_editor.insert(tk.END, "=" * 50 + "\n")
                 self.text_editor.insert(tk.END, display_content)
                 
+                # Displaying a file is not an edit to the document
+                self.text_editor.edit_modified(self.is_modified)
+                
                 self.status_bar.config(text=f"Displayed CSV: {Path(file_path).name}")
             except Exception as e:
                 messagebox.showerror("Error", f"Could not open CSV file:\n{e}")
@@ -988,6 +1136,8 @@ class FileGUIIntegration:
         )
         
         if file_path:
+            self.stop_loader()
+            self.close_large_view()
             try:
                 with open(file_path, 'r', encoding='utf-8') as file:
                     data = json.load(file)
@@ -1000,6 +1150,9 @@ class FileGUIIntegration:
                 self.text_editor.insert(tk.END, "=" * 50 + "\n")
                 self.text_editor.insert(tk.END, formatted_json)
                 
+                # Displaying a file is not an edit to the document
+                self.text_editor.edit_modified(self.is_modified)
+                
                 self.status_bar.config(text=f"Displayed JSON: {Path(file_path).name}")
             except json.JSONDecodeError as e:
                 messagebox.showerror("JSON Error", f"Invalid JSON file:\n{e}")
@@ -1015,6 +1168,10 @@ class FileGUIIntegration:
     
     def save_as_file(self):
         """Save file with a new name"""
+        if self.large_view:
+            messagebox.showinfo("Read-Only", "Large files are opened read-only and cannot be saved")
+            return
+        
         file_path = filedialog.asksaveasfilename(
             title="Save File As",
             defaultextension=".txt",
@@ -1026,21 +1183,30 @@ class FileGUIIntegration:
         )
         
         if file_path:
-            self.save_to_file(file_path)
-            self.current_file = file_path
-            self.update_file_info()
+            if self.save_to_file(file_path):
+                self.current_file = file_path
+                self.refresh_file_stat()
+                self.update_file_info()
     
     def save_to_file(self, file_path):
         """Save content to specified file"""
+        if self.large_view:
+            messagebox.showinfo("Read-Only", "Large files are opened read-only and cannot be saved")
+            return
+        
         try:
-            content = self.text_editor.get("1.0", tk.END)
-            with open(file_path, 'w', encoding='utf-8') as file:
-                file.write(content)
+            # Write to a temporary file and swap it in, so a failed save
+            # never leaves a truncated file behind
+            save_text_atomically(self.text_editor, file_path)
             
-            self.is_modified = False
+            if file_path == self.current_file:
+                self.refresh_file_stat()
+            self.set_modified(False)
             self.status_bar.config(text=f"Saved: {Path(file_path).name}")
+            return True
         except Exception as e:
             messagebox.showerror("Error", f"Could not save file:\n{e}")
+            return False
     
     def check_save_changes(self):
         """Check if user wants to save changes before continuing"""
@@ -1062,22 +1228,43 @@ class FileGUIIntegration:
     
     def on_text_change(self, event):
         """Handle text changes"""
-        self.is_modified = True
+        if self.large_view or self.loader:
+            return  # Read-only view, or chunks still arriving
+        modified = bool(self.text_editor.edit_modified())
+        if modified != self.is_modified:
+            self.is_modified = modified
+            self.update_file_info()
+    
+    def set_modified(self, modified):
+        """Set the document's modified flag and refresh the file info"""
+        self.text_editor.edit_modified(modified)
+        self.is_modified = modified
         self.update_file_info()
     
+    def refresh_file_stat(self):
+        """Re-read the current file's size and timestamp from disk"""
+        self.file_stat = None
+        if self.current_file:
+            try:
+                self.file_stat = Path(self.current_file).stat()
+            except OSError:
+                pass
+    
     def update_file_info(self):
         """Update file information display"""
         if self.current_file:
             file_path = Path(self.current_file)
             info = f"File: {file_path.name}"
             
-            if file_path.exists():
-                stat = file_path.stat()
+            if self.file_stat:
+                stat = self.file_stat
                 size = stat.st_size
                 modified = datetime.fromtimestamp(stat.st_mtime)
                 info += f" | Size: {size} bytes | Modified: {modified.strftime('%Y-%m-%d %H:%M:%S')}"
             
-            if self.is_modified:
+            if self.large_view:
+                info += " | Read-only"
+            elif self.is_modified:
                 info += " | Modified*"
         else:
             info = "New file"
@@ -1128,8 +1315,9 @@ def main():
         demo.demonstrate_filesystem_operations()
     
     elif choice == "6":
-        app = FileGUIIntegration()
-        app.run()
+        host = DemoHost("File I/O Operations")
+        host.run([("GUI File Integration", FileGUIIntegration)])
+        host.print_startup_times()
     
     elif choice == "7":
         # Run all non-GUI demos
@@ -12,16 +12,19 @@ This file contains progressive examples of GUI programming concepts:
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, colorchooser
+from tkinter import ttk, messagebox, filedialog, colorchooser, simpledialog
 import json
 import os
+from gui_helpers import (AsyncFileLoader, CanvasScene, DemoHost, LargeFileView, RecordStore,
+                         ResizeCoalescer, VirtualTreeview, save_text_atomically,
+                         simplify_polyline)
 
 
 class BasicWidgetDemo:
     """Demonstrates basic Tkinter widgets"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Basic Widget Demo")
         self.root.geometry("400x500")
         
@@ -150,8 +153,8 @@ class BasicWidgetDemo:
 class LayoutManagerDemo:
     """Demonstrates different layout managers"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Layout Manager Demo")
         self.root.geometry("600x400")
         
@@ -272,8 +275,8 @@ class LayoutManagerDemo:
 class EventHandlingDemo:
     """Demonstrates various event handling techniques"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Event Handling Demo")
         self.root.geometry("500x400")
         
@@ -293,6 +296,9 @@ class EventHandlingDemo:
         self.canvas = tk.Canvas(self.root, width=400, height=250, bg="white")
         self.canvas.pack(pady=10)
         
+        # Index drawn shapes and cap how many stay on the canvas
+        self.scene = CanvasScene(self.canvas, max_items=5000)
+        
         # Event log
         log_frame = tk.Frame(self.root)
         log_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -329,6 +335,7 @@ class EventHandlingDemo:
         self.canvas.bind("<Button-3>", self.on_right_click)
         self.canvas.bind("<Double-Button-1>", self.on_double_click)
         self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.on_release)
         self.canvas.bind("<Motion>", self.on_mouse_move)
         self.canvas.bind("<Enter>", self.on_mouse_enter)
         self.canvas.bind("<Leave>", self.on_mouse_leave)
@@ -340,14 +347,18 @@ class EventHandlingDemo:
         # Make canvas focusable for keyboard events
         self.canvas.focus_set()
         
-        # Window events
-        self.root.bind("<Configure>", self.on_window_resize)
+        # Window events; log a drag-resize once it settles, not per Configure
+        self.resizer = ResizeCoalescer(self.root, self.on_window_resize)
         self.root.protocol("WM_DELETE_WINDOW", self.on_window_close)
         
         # Track variables for drawing
         self.last_x = None
         self.last_y = None
         self.drawing = False
+        
+        # The stroke being drawn is one polyline item that grows as we drag
+        self.current_stroke = None
+        self.stroke_points = []
     
     def log_event(self, message):
         """Add event to log"""
@@ -357,30 +368,56 @@ class EventHandlingDemo:
     def on_left_click(self, event):
         """Handle left mouse click"""
         self.log_event(f"Left click at ({event.x}, {event.y})")
-        self.canvas.create_oval(event.x-3, event.y-3, event.x+3, event.y+3, 
-                               fill="red", outline="darkred")
+        self.scene.create("oval", event.x-3, event.y-3, event.x+3, event.y+3, 
+                         fill="red", outline="darkred")
         self.last_x, self.last_y = event.x, event.y
         self.drawing = True
     
     def on_right_click(self, event):
         """Handle right mouse click"""
         self.log_event(f"Right click at ({event.x}, {event.y})")
-        self.canvas.create_rectangle(event.x-10, event.y-10, event.x+10, event.y+10,
-                                   fill="blue", outline="darkblue")
+        self.scene.create("rectangle", event.x-10, event.y-10, event.x+10, event.y+10,
+                        fill="blue", outline="darkblue")
     
     def on_double_click(self, event):
         """Handle double click"""
         self.log_event(f"Double click at ({event.x}, {event.y})")
-        self.canvas.create_text(event.x, event.y, text="Double!", 
-                               fill="green", font=("Arial", 12, "bold"))
+        self.scene.create("text", event.x, event.y, text="Double!", 
+                         fill="green", font=("Arial", 12, "bold"))
     
     def on_drag(self, event):
         """Handle mouse drag (drawing)"""
         if self.drawing and self.last_x and self.last_y:
-            self.canvas.create_line(self.last_x, self.last_y, event.x, event.y,
-                                   fill="black", width=2)
+            if self.current_stroke is None:
+                self.current_stroke = self.scene.create("line", self.last_x, self.last_y, event.x, event.y,
+                                                        fill="black", width=2,
+                                                        capstyle="round", joinstyle="round")
+                # Other items may be evicted while drawing, but not the stroke in progress
+                self.scene.pin(self.current_stroke)
+                self.stroke_points = [(self.last_x, self.last_y), (event.x, event.y)]
+            else:
+                # Append the new point instead of creating another segment
+                self.scene.extend(self.current_stroke, event.x, event.y)
+                self.stroke_points.append((event.x, event.y))
             self.last_x, self.last_y = event.x, event.y
     
+    def on_release(self, event):
+        """Handle mouse button release (finish the stroke)"""
+        self.finish_stroke()
+    
+    def finish_stroke(self):
+        """Simplify the finished stroke so it keeps only the points that matter"""
+        if self.current_stroke is not None:
+            self.scene.unpin(self.current_stroke)
+            if len(self.stroke_points) > 2:
+                simplified = simplify_polyline(self.stroke_points, tolerance=1.0)
+                if len(simplified) < len(self.stroke_points):
+                    coords = [value for point in simplified for value in point]
+                    self.scene.coords(self.current_stroke, *coords)
+        
+        self.current_stroke = None
+        self.stroke_points = []
+    
     def on_mouse_move(self, event):
         """Handle mouse movement (update coordinates)"""
         # Only log occasionally to avoid spam
@@ -396,6 +433,7 @@ class EventHandlingDemo:
         self.log_event("Mouse left canvas")
         self.canvas.config(cursor="")
         self.drawing = False
+        self.finish_stroke()
     
     def on_key_press(self, event):
         """Handle key press"""
@@ -413,11 +451,11 @@ class EventHandlingDemo:
         """Handle Escape key"""
         self.log_event("Escape key pressed - clearing selection")
         self.drawing = False
+        self.finish_stroke()
     
-    def on_window_resize(self, event):
+    def on_window_resize(self, width, height):
         """Handle window resize"""
-        if event.widget == self.root:  # Only log main window resize
-            self.log_event(f"Window resized to {event.width}x{event.height}")
+        self.log_event(f"Window resized to {width}x{height}")
     
     def on_window_close(self):
         """Handle window close"""
@@ -427,7 +465,9 @@ class EventHandlingDemo:
     
     def clear_canvas(self):
         """Clear the canvas"""
-        self.canvas.delete("all")
+        self.scene.clear()
+        self.current_stroke = None
+        self.stroke_points = []
         self.log_event("Canvas cleared")
     
     def clear_log(self):
@@ -441,13 +481,18 @@ class EventHandlingDemo:
 class FileDialogDemo:
     """Demonstrates file dialogs and file operations"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("File Dialog Demo")
         self.root.geometry("600x500")
         
         self.current_filename = None
+        self.loader = None
+        self.large_view = None
         self.setup_widgets()
+        
+        # Stop the loader thread and release a mapped file with the window
+        self.root.bind("<Destroy>", self.on_destroy, add="+")
     
     def setup_widgets(self):
         # Menu bar
@@ -461,12 +506,16 @@ class FileDialogDemo:
         file_menu.add_command(label="Save", command=self.save_file, accelerator="Ctrl+S")
         file_menu.add_command(label="Save As", command=self.save_as_file)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Open Large File (Read-Only)", command=self.open_large_file)
+        file_menu.add_command(label="Go to Line", command=self.go_to_line, accelerator="Ctrl+G")
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.root.destroy)
         
         # Keyboard shortcuts
         self.root.bind("<Control-n>", lambda e: self.new_file())
         self.root.bind("<Control-o>", lambda e: self.open_file())
         self.root.bind("<Control-s>", lambda e: self.save_file())
+        self.root.bind("<Control-g>", lambda e: self.go_to_line())
         
         # Toolbar
         toolbar = tk.Frame(self.root, relief="raised", borderwidth=1)
@@ -493,8 +542,8 @@ class FileDialogDemo:
         text_scroll_frame.pack(fill="both", expand=True)
         
         # Vertical scrollbar
-        v_scrollbar = tk.Scrollbar(text_scroll_frame)
-        v_scrollbar.pack(side="right", fill="y")
+        self.v_scrollbar = tk.Scrollbar(text_scroll_frame)
+        self.v_scrollbar.pack(side="right", fill="y")
         
         # Horizontal scrollbar
         h_scrollbar = tk.Scrollbar(text_scroll_frame, orient="horizontal")
@@ -503,13 +552,13 @@ class FileDialogDemo:
         # Text widget
         self.text_area = tk.Text(text_scroll_frame,
                                 wrap="none",
-                                yscrollcommand=v_scrollbar.set,
+                                yscrollcommand=self.v_scrollbar.set,
                                 xscrollcommand=h_scrollbar.set,
                                 font=("Courier", 11),
                                 undo=True)
         self.text_area.pack(fill="both", expand=True)
         
-        v_scrollbar.config(command=self.text_area.yview)
+        self.v_scrollbar.config(command=self.text_area.yview)
         h_scrollbar.config(command=self.text_area.xview)
         
         # Status bar
@@ -519,8 +568,15 @@ class FileDialogDemo:
                                   anchor="w")
         self.status_bar.pack(fill="x", side="bottom")
         
-        # Track changes
-        self.text_area.bind("<KeyPress>", self.on_text_change)
+        # Progress bar and cancel button, shown only while a file loads
+        self.load_frame = tk.Frame(self.root)
+        self.load_progress = ttk.Progressbar(self.load_frame, mode="determinate", maximum=100)
+        self.load_progress.pack(side="left", fill="x", expand=True, padx=5, pady=2)
+        tk.Button(self.load_frame, text="Cancel", command=self.cancel_loading).pack(side="right", padx=5)
+        
+        # Track changes; Tk fires <<Modified>> only when the flag flips,
+        # not on every keystroke
+        self.text_area.bind("<<Modified>>", self.on_text_change)
         self.text_area.bind("<Button-1>", self.update_cursor_position)
         self.text_area.bind("<KeyRelease>", self.update_cursor_position)
         
@@ -530,10 +586,11 @@ class FileDialogDemo:
     def new_file(self):
         """Create a new file"""
         if self.check_save_changes():
+            self.stop_loader()
+            self.close_large_view()
             self.text_area.delete("1.0", tk.END)
             self.current_filename = None
-            self.is_modified = False
-            self.update_title()
+            self.set_modified(False)
             self.status_bar.config(text="New file created")
     
     def open_file(self):
@@ -551,20 +608,143 @@ class FileDialogDemo:
         )
         
         if filename:
+            self.stop_loader()
+            self.close_large_view()
+            self.text_area.delete("1.0", tk.END)
+            self.current_filename = None
+            self.set_modified(False)
+            
+            # Read on a worker thread so large files don't freeze the window
+            self.loader = AsyncFileLoader(self.root, filename,
+                                          on_chunk=self.on_load_chunk,
+                                          on_progress=self.on_load_progress,
+                                          on_done=lambda: self.on_load_done(filename),
+                                          on_error=self.on_load_error)
             try:
-                with open(filename, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                
-                self.text_area.delete("1.0", tk.END)
-                self.text_area.insert("1.0", content)
-                
-                self.current_filename = filename
-                self.is_modified = False
-                self.update_title()
-                self.status_bar.config(text=f"Opened: {os.path.basename(filename)}")
-                
+                self.loader.start()
+            except Exception as e:
+                self.loader = None
+                messagebox.showerror("Error", f"Could not open file:\n{e}")
+                return
+            
+            # Typing into a half-loaded file would be saved or lost unnoticed
+            self.text_area.config(state="disabled")
+            self.load_progress.config(value=0)
+            self.load_frame.pack(fill="x", side="bottom", after=self.status_bar)
+            self.status_bar.config(text=f"Opening: {os.path.basename(filename)}...")
+    
+    def on_load_chunk(self, chunk):
+        """Append the next chunk of a file that is loading"""
+        self.text_area.config(state="normal")
+        self.text_area.insert(tk.END, chunk)
+        self.text_area.config(state="disabled")
+    
+    def on_load_progress(self, bytes_read, total_bytes):
+        """Show how much of the file has been read"""
+        if total_bytes:
+            self.load_progress.config(value=100 * bytes_read / total_bytes)
+    
+    def on_load_done(self, filename):
+        """Finish opening a file once every chunk has arrived"""
+        self.stop_loader()
+        
+        # Chunk inserts should not be undoable one by one
+        self.text_area.edit_reset()
+        self.text_area.mark_set(tk.INSERT, "1.0")
+        self.text_area.see("1.0")
+        
+        self.current_filename = filename
+        self.set_modified(False)
+        self.status_bar.config(text=f"Opened: {os.path.basename(filename)}")
+    
+    def on_load_error(self, error):
+        """Abandon a load that failed part way through"""
+        self.stop_loader()
+        self.text_area.delete("1.0", tk.END)
+        self.text_area.edit_reset()
+        self.set_modified(False)
+        self.status_bar.config(text="Ready")
+        messagebox.showerror("Error", f"Could not open file:\n{error}")
+    
+    def cancel_loading(self):
+        """Cancel a load in progress and discard the partial text"""
+        if self.loader:
+            self.stop_loader()
+            self.text_area.delete("1.0", tk.END)
+            self.text_area.edit_reset()
+            self.set_modified(False)
+            self.status_bar.config(text="Open cancelled")
+    
+    def stop_loader(self):
+        """Stop any running loader and hide the progress bar"""
+        if self.loader:
+            self.loader.cancel()
+            self.loader = None
+            self.text_area.config(state="normal")  # Disabled while loading
+        self.load_frame.pack_forget()
+    
+    def open_large_file(self):
+        """Open a file too big to edit in a read-only, memory-mapped view"""
+        if not self.check_save_changes():
+            return
+        
+        filename = filedialog.askopenfilename(
+            title="Open Large File (Read-Only)",
+            filetypes=[
+                ("Text files", "*.txt *.log"),
+                ("All files", "*.*")
+            ]
+        )
+        
+        if filename:
+            self.stop_loader()
+            self.close_large_view()
+            try:
+                self.large_view = LargeFileView(self.text_area, self.v_scrollbar, filename,
+                                                on_indexed=self.on_large_file_indexed)
             except Exception as e:
                 messagebox.showerror("Error", f"Could not open file:\n{e}")
+                return
+            
+            self.current_filename = filename
+            self.set_modified(False)
+    
+    def on_large_file_indexed(self, bytes_indexed, total_bytes):
+        """Report progress while the large file's line index is built"""
+        name = os.path.basename(self.current_filename or "")
+        if bytes_indexed < total_bytes:
+            percent = 100 * bytes_indexed // total_bytes
+            self.status_bar.config(text=f"Indexing {name}: {percent}%")
+        else:
+            lines = self.large_view.line_count()
+            self.status_bar.config(text=f"Opened read-only: {name} ({lines:,} lines)")
+    
+    def close_large_view(self):
+        """Leave large file mode and make the editor editable again"""
+        if self.large_view:
+            self.large_view.close()
+            self.large_view = None
+            self.current_filename = None
+    
+    def on_destroy(self, event):
+        """Release the file being loaded or viewed when the window closes"""
+        if event.widget is self.root:  # Not one of its children
+            if self.loader:
+                self.loader.cancel()
+                self.loader = None
+            self.close_large_view()
+    
+    def go_to_line(self):
+        """Jump to a line number"""
+        line = simpledialog.askinteger("Go to Line", "Line number:",
+                                       parent=self.root, minvalue=1)
+        if line:
+            if self.large_view:
+                self.large_view.go_to_line(line)
+            else:
+                self.text_area.mark_set(tk.INSERT, f"{line}.0")
+                self.text_area.see(tk.INSERT)
+            self.status_bar.config(text=f"Line: {line}")
     
     def save_file(self):
         """Save the current file"""
@@ -575,6 +755,10 @@ class FileDialogDemo:
     
     def save_as_file(self):
         """Save file with a new name"""
+        if self.large_view:
+            messagebox.showinfo("Read-Only", "Large files are opened read-only and cannot be saved")
+            return
+        
         filename = filedialog.asksaveasfilename(
             title="Save File As",
             defaultextension=".txt",
@@ -592,13 +776,16 @@ class FileDialogDemo:
     
     def save_to_file(self, filename):
         """Save content to specified file"""
+        if self.large_view:
+            messagebox.showinfo("Read-Only", "Large files are opened read-only and cannot be saved")
+            return
+        
         try:
-            content = self.text_area.get("1.0", tk.END)
-            with open(filename, 'w', encoding='utf-8') as file:
-                file.write(content)
+            # Write to a temporary file and swap it in, so a failed save
+            # never leaves a truncated file behind
+            save_text_atomically(self.text_area, filename)
             
-            self.is_modified = False
-            self.update_title()
+            self.set_modified(False)
             self.status_bar.config(text=f"Saved: {os.path.basename(filename)}")
             
         except Exception as e:
@@ -664,7 +851,17 @@ class FileDialogDemo:
     
     def on_text_change(self, event):
         """Handle text changes"""
-        self.is_modified = True
+        if self.large_view or self.loader:
+            return  # Read-only view, or chunks still arriving
+        modified = bool(self.text_area.edit_modified())
+        if modified != self.is_modified:
+            self.is_modified = modified
+            self.update_title()
+    
+    def set_modified(self, modified):
+        """Set the document's modified flag and refresh the title"""
+        self.text_area.edit_modified(modified)
+        self.is_modified = modified
         self.update_title()
     
     def update_cursor_position(self, event=None):
@@ -675,6 +872,9 @@ class FileDialogDemo:
         """Internal method to update cursor position"""
         cursor_pos = self.text_area.index(tk.INSERT)
         line, col = cursor_pos.split('.')
+        if self.large_view:
+            # The widget only holds a window of the file
+            line = int(line) + self.large_view.first_line
         self.status_bar.config(text=f"Line: {line}, Column: {int(col)+1}")
     
     def update_title(self):
@@ -686,7 +886,9 @@ class FileDialogDemo:
         else:
             title += " - Untitled"
         
-        if self.is_modified:
+        if self.large_view:
+            title += " [Read-Only]"
+        elif self.is_modified:
             title += " *"
         
         self.root.title(title)
@@ -698,14 +900,18 @@ class FileDialogDemo:
 class AdvancedGUIDemo:
     """Demonstrates advanced GUI patterns and techniques"""
     
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, master=None):
+        self.root = tk.Tk() if master is None else tk.Toplevel(master)
         self.root.title("Advanced GUI Demo")
         self.root.geometry("700x600")
         
-        self.data = []
+        self.data = RecordStore()
+        self.jsonl_load = None  # (open file, after id) while streaming a load
         self.setup_widgets()
         self.load_sample_data()
+        
+        # Close a JSON Lines file that is still streaming with the window
+        self.root.bind("<Destroy>", self.on_destroy, add="+")
     
     def setup_widgets(self):
         # Create notebook for tabs
@@ -776,9 +982,14 @@ class AdvancedGUIDemo:
         self.tree.column("Email", width=200)
         
         # Scrollbars for treeview
-        tree_scroll_y = ttk.Scrollbar(display_frame, orient="vertical", command=self.tree.yview)
+        tree_scroll_y = ttk.Scrollbar(display_frame, orient="vertical")
         tree_scroll_x = ttk.Scrollbar(display_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=tree_scroll_y.set, xscrollcommand=tree_scroll_x.set)
+        self.tree.configure(xscrollcommand=tree_scroll_x.set)
+        
+        # Only the rows in view live in the treeview; the vertical
+        # scrollbar moves a window over self.data instead
+        self.tree_view = VirtualTreeview(self.tree, tree_scroll_y,
+                                         self.data.slot_count, self.tree_rows)
         
         # Pack treeview and scrollbars
         self.tree.grid(row=0, column=0, sticky="nsew")
@@ -890,7 +1101,7 @@ Features:
         ]
         
         for entry in sample_data:
-            self.data.append(entry)
+            self.data.add(entry)
         
         self.refresh_tree()
     
@@ -931,8 +1142,8 @@ Features:
             "email": email
         }
         
-        self.data.append(entry)
-        self.refresh_tree()
+        self.data.add(entry)
+        self.tree_view.refresh()
         self.clear_form()
         
         messagebox.showinfo("Success", "Entry added successfully")
@@ -944,9 +1155,8 @@ Features:
             messagebox.showwarning("Warning", "Please select an entry to update")
             return
         
-        # Get selected index
-        item = selection[0]
-        index = self.tree.index(item)
+        # The treeview iid is the record's ID
+        record_id = selection[0]
         
         # Get form data and validate (same as add_entry)
         name = self.name_entry.get().strip()
@@ -965,14 +1175,16 @@ Features:
             return
         
         # Update data
-        self.data[index] = {
+        entry = {
             "name": name,
             "age": age,
             "city": city,
             "email": email
         }
+        self.data.update(record_id, entry)
         
-        self.refresh_tree()
+        # Only the edited row changes in the tree
+        self.tree_view.refresh_row(record_id, self.tree_values(entry))
         self.clear_form()
         messagebox.showinfo("Success", "Entry updated successfully")
     
@@ -987,12 +1199,11 @@ Features:
             if not messagebox.askyesno("Confirm Delete", "Delete selected entry?"):
                 return
         
-        # Get selected index and delete
-        item = selection[0]
-        index = self.tree.index(item)
-        del self.data[index]
+        # Delete by record ID (no shifting of later entries)
+        record_id = selection[0]
+        self.data.delete(record_id)
         
-        self.refresh_tree()
+        self.tree_view.refresh()
         self.clear_form()
         messagebox.showinfo("Success", "Entry deleted successfully")
     
@@ -1006,6 +1217,7 @@ Features:
     def clear_all_data(self):
         """Clear all data entries"""
         if messagebox.askyesno("Confirm Clear", "Delete all data entries?"):
+            self.cancel_jsonl_load()
             self.data.clear()
             self.refresh_tree()
             messagebox.showinfo("Success", "All data cleared")
@@ -1014,9 +1226,8 @@ Features:
         """Handle tree selection - populate form"""
         selection = self.tree.selection()
         if selection:
-            item = selection[0]
-            index = self.tree.index(item)
-            entry = self.data[index]
+            record_id = selection[0]
+            entry = self.data.get(record_id)
             
             # Populate form
             self.clear_form()
@@ -1025,35 +1236,45 @@ Features:
             self.city_entry.insert(0, entry["city"])
             self.email_entry.insert(0, entry["email"])
     
+    def tree_values(self, entry):
+        """Return the treeview column values for a data entry"""
+        return (
+            entry["name"],
+            entry["age"],
+            entry["city"],
+            entry["email"]
+        )
+    
+    def tree_rows(self, start, count):
+        """Return (iid, values) pairs for the rows the treeview should show"""
+        return [(record_id, self.tree_values(entry))
+                for record_id, entry in self.data.window(start, count)]
+    
     def refresh_tree(self):
-        """Refresh the treeview with current data"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Add current data
-        for entry in self.data:
-            self.tree.insert("", "end", values=(
-                entry["name"],
-                entry["age"],
-                entry["city"],
-                entry["email"]
-            ))
+        """Refresh the treeview after bulk changes (loads, clear all)"""
+        # Only the visible window is re-read, however large the data is
+        self.tree_view.refresh()
     
     def load_from_json(self):
         """Load data from JSON file"""
         filename = filedialog.askopenfilename(
             title="Load Data",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=[("JSON files", "*.json"),
+                       ("JSON Lines files", "*.jsonl"),
+                       ("All files", "*.*")]
         )
         
-        if filename:
+        if filename and filename.lower().endswith(".jsonl"):
+            self.load_from_jsonl(filename)
+        elif filename:
             try:
                 with open(filename, 'r') as file:
                     loaded_data = json.load(file)
                 
                 if isinstance(loaded_data, list):
-                    self.data = loaded_data
+                    self.cancel_jsonl_load()
+                    self.data.clear()
+                    self.data.add_many(loaded_data)
                     self.refresh_tree()
                     messagebox.showinfo("Success", f"Loaded {len(self.data)} entries")
                 else:
@@ -1067,19 +1288,82 @@ Features:
         filename = filedialog.asksaveasfilename(
             title="Save Data",
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=[("JSON files", "*.json"),
+                       ("JSON Lines files", "*.jsonl"),
+                       ("All files", "*.*")]
         )
         
         if filename:
             try:
                 with open(filename, 'w') as file:
-                    json.dump(self.data, file, indent=2)
+                    if filename.lower().endswith(".jsonl"):
+                        # One record per line, written as we go
+                        for entry in self.data:
+                            file.write(json.dumps(entry) + "\n")
+                    else:
+                        json.dump(list(self.data), file, indent=2)
                 
                 messagebox.showinfo("Success", f"Saved {len(self.data)} entries")
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Could not save file:\n{e}")
     
+    def load_from_jsonl(self, filename, chunk_size=2000):
+        """Stream a JSON Lines file (one record per line) into the table"""
+        self.cancel_jsonl_load()
+        
+        try:
+            file = open(filename, 'r', encoding='utf-8')
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not load file:\n{e}")
+            return
+        
+        # Parse into a separate list so a bad line leaves the current data alone
+        self.jsonl_load = (file, None)
+        self.load_jsonl_chunk(file, chunk_size, 0, [])
+    
+    def load_jsonl_chunk(self, file, chunk_size, line_number, records):
+        """Read the next chunk of records, then yield to the event loop"""
+        try:
+            for _ in range(chunk_size):
+                line = file.readline()
+                if not line:
+                    self.cancel_jsonl_load()
+                    self.data.clear()
+                    self.data.add_many(records)
+                    self.refresh_tree()
+                    messagebox.showinfo("Success", f"Loaded {len(self.data)} entries")
+                    return
+                
+                line_number += 1
+                if line.strip():
+                    entry = json.loads(line)
+                    if not isinstance(entry, dict):
+                        raise ValueError("each line must be a JSON object")
+                    records.append(entry)
+        except Exception as e:
+            self.cancel_jsonl_load()
+            messagebox.showerror("Error", f"Could not load line {line_number}:\n{e}")
+            return
+        
+        # Keep the UI responsive between chunks
+        after_id = self.root.after(1, self.load_jsonl_chunk, file, chunk_size, line_number, records)
+        self.jsonl_load = (file, after_id)
+    
+    def cancel_jsonl_load(self):
+        """Stop a JSON Lines load that is still streaming"""
+        if self.jsonl_load:
+            file, after_id = self.jsonl_load
+            if after_id is not None:
+                self.root.after_cancel(after_id)
+            file.close()
+            self.jsonl_load = None
+    
+    def on_destroy(self, event):
+        """Stop a streaming load when the window closes"""
+        if event.widget is self.root:  # Not one of its children
+            self.cancel_jsonl_load()
+    
     def export_to_csv(self):
         """Export data to CSV file"""
         filename = filedialog.asksaveasfilename(
@@ -1093,10 +1377,12 @@ Features:
                 import csv
                 with open(filename, 'w', newline='') as file:
                     if self.data:
-                        fieldnames = self.data[0].keys()
-                        writer = csv.DictWriter(file, fieldnames=fieldnames)
+                        records = iter(self.data)
+                        first = next(records)
+                        writer = csv.DictWriter(file, fieldnames=first.keys())
                         writer.writeheader()
-                        writer.writerows(self.data)
+                        writer.writerow(first)
+                        writer.writerows(records)
                 
                 messagebox.showinfo("Success", f"Exported {len(self.data)} entries to CSV")
                 
@@ -1149,37 +1435,26 @@ def main():
     
     choice = input("\nEnter your choice (1-6): ").strip()
     
-    if choice == "1":
-        app = BasicWidgetDemo()
-        app.run()
-    elif choice == "2":
-        app = LayoutManagerDemo()
-        app.run()
-    elif choice == "3":
-        app = EventHandlingDemo()
-        app.run()
-    elif choice == "4":
-        app = FileDialogDemo()
-        app.run()
-    elif choice == "5":
-        app = AdvancedGUIDemo()
-        app.run()
+    demos = [
+        ("Basic Widgets", BasicWidgetDemo),
+        ("Layout Managers", LayoutManagerDemo),
+        ("Event Handling", EventHandlingDemo),
+        ("File Dialogs", FileDialogDemo),
+        ("Advanced GUI", AdvancedGUIDemo)
+    ]
+    
+    if choice in ("1", "2", "3", "4", "5"):
+        selected = [demos[int(choice) - 1]]
     elif choice == "6":
-        # Run demos sequentially
-        demos = [
-            ("Basic Widgets", BasicWidgetDemo),
-            ("Layout Managers", LayoutManagerDemo),
-            ("Event Handling", EventHandlingDemo),
-            ("File Dialogs", FileDialogDemo),
-            ("Advanced GUI", AdvancedGUIDemo)
-        ]
-        
-        for name, demo_class in demos:
-            print(f"\nRunning {name} demo...")
-            app = demo_class()
-            app.run()
+        # Run demos sequentially, all in one Tk interpreter
+        selected = demos
     else:
         print("Invalid choice. Please run the script again.")
+        return
+    
+    host = DemoHost("GUI Programming Examples")
+    host.run(selected)
+    host.print_startup_times()
 
 
 if __name__ == "__main__":
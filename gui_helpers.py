@@ -0,0 +1,2221 @@
+#!/usr/bin/env python3
+"""
+Week 4 GUI Helpers - Reusable Building Blocks for the Tkinter Demos
+CSC 242 - Object-Oriented Programming
+
+This file collects small helper classes that several demo files share:
+1. Batched, bounded event logging for Text widgets
+2. Per-frame coalescing of mouse motion events
+3. Spatially indexed canvas scenes with an optional item budget
+4. Polyline simplification for freehand strokes
+5. Virtual scrolling for Treeviews over large datasets
+6. Record storage with stable IDs
+7. Background file loading that streams chunks to the Tk thread
+8. Memory-mapped, read-only viewing of very large text files
+9. Atomic, chunked saving of Text widget contents
+10. Debouncing of bursts of calls such as keystrokes
+11. Word-prefix search over contact records
+12. Paged, virtual scrolling for Listboxes
+13. SQLite-backed contact storage
+14. A shared cache of decoded PhotoImages
+15. A single-interpreter host for switching between demo windows
+16. Opt-in profiling of bound event handlers
+17. A watchdog that logs where the event loop is stuck
+18. A thread-safe event bus for virtual events with payloads
+19. A drift-free timer wheel driven by one after() callback
+20. Declarative, cancellable event chains with per-stage latency
+21. An event-driven cache of a window's geometry, state and focus
+22. A resize coalescer with a settled callback and a rate-capped preview
+"""
+
+import bisect
+import heapq
+import json
+import logging
+import mmap
+import os
+import queue
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import weakref
+import tkinter as tk
+from tkinter import ttk
+from tkinter import font as tkfont
+from collections import deque, OrderedDict
+
+
+WORD_PATTERN = re.compile(r"[^\W_]+")
+NON_DIGIT_PATTERN = re.compile(r"\D")
+
+
+class EventLog:
+    """Batched, bounded event log that writes into a Text widget
+    
+    Lines are queued and written with a single insert per idle tick, so a
+    burst of events costs one re-layout instead of one per event.  Only the
+    most recent max_lines lines are kept; older lines are dropped with a
+    single delete.
+    """
+    
+    def __init__(self, text_widget, max_lines=500):
+        self.text_widget = text_widget
+        self.max_lines = max_lines
+        
+        # Lines waiting for the next flush (oldest fall off automatically)
+        self.pending = deque(maxlen=max_lines)
+        self.line_count = 0
+        self.flush_id = None
+    
+    def write(self, message):
+        """Queue a line and schedule a flush if one is not already pending"""
+        self.pending.append(message)
+        if self.flush_id is None:
+            self.flush_id = self.text_widget.after_idle(self.flush)
+    
+    def flush(self):
+        """Write all queued lines with one insert and trim old lines"""
+        self.flush_id = None
+        if not self.pending:
+            return
+        
+        text = "\n".join(self.pending) + "\n"
+        self.pending.clear()
+        
+        try:
+            self.text_widget.insert(tk.END, text)
+            self.line_count += text.count("\n")  # A message may span several lines
+            
+            # Drop the oldest lines in one delete
+            overflow = self.line_count - self.max_lines
+            if overflow > 0:
+                self.text_widget.delete("1.0", f"{overflow + 1}.0")
+                self.line_count -= overflow
+            
+            self.text_widget.see(tk.END)
+        except tk.TclError:
+            pass  # Widget was destroyed before the flush ran
+    
+    def clear(self):
+        """Discard queued lines and empty the widget"""
+        if self.flush_id is not None:
+            self.text_widget.after_cancel(self.flush_id)
+            self.flush_id = None
+        self.pending.clear()
+        self.text_widget.delete("1.0", tk.END)
+        self.line_count = 0
+
+
+class MotionCoalescer:
+    """Coalesce high-rate pointer events into one update per frame
+    
+    Only the newest event is kept; the callback runs at most once every
+    interval milliseconds with that event, so a 1000 Hz mouse costs about
+    as much as a 60 Hz one.
+    """
+    
+    def __init__(self, widget, callback, interval=16):
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval
+        
+        self.latest_event = None
+        self.after_id = None
+    
+    def submit(self, event):
+        """Record the newest event and schedule delivery for the next frame"""
+        self.latest_event = event
+        if self.after_id is None:
+            self.after_id = self.widget.after(self.interval, self.deliver)
+    
+    def deliver(self):
+        """Pass the newest event to the callback"""
+        self.after_id = None
+        event, self.latest_event = self.latest_event, None
+        if event is not None:
+            self.callback(event)
+    
+    def flush(self):
+        """Deliver a pending event right away (e.g. on button release)"""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.deliver()
+    
+    def cancel(self):
+        """Drop a pending event without delivering it"""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        self.latest_event = None
+
+
+class CanvasScene:
+    """Track the items drawn on a Canvas with a uniform grid index
+    
+    Every item created through the scene is filed under the grid cells its
+    bounding box touches, so hit-testing and region queries only look at
+    nearby items instead of asking Tk to scan the whole canvas.  With
+    max_items set, the oldest items are deleted once the budget is exceeded;
+    pin() keeps an item that is still in use (e.g. a rubber band being
+    dragged) from being evicted.
+    """
+    
+    def __init__(self, canvas, cell_size=50, max_items=None, tag="scene"):
+        self.canvas = canvas
+        self.cell_size = cell_size
+        self.max_items = max_items
+        self.tag = tag
+        
+        # item id -> bounding box, in creation order (oldest first)
+        self.items = OrderedDict()
+        # (column, row) -> set of item ids touching that cell
+        self.grid = {}
+        self.pinned = set()
+    
+    def create(self, kind, *coords, **options):
+        """Create a canvas item (oval, line, text, ...) and index it"""
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        
+        create_method = getattr(self.canvas, f"create_{kind}")
+        item = create_method(*coords, tags=(self.tag,) + tuple(tags), **options)
+        
+        self.add_to_index(item, self.bounds_for(item, coords))
+        self.enforce_budget()
+        return item
+    
+    def coords(self, item, *coords):
+        """Move an existing item and update its place in the index"""
+        self.canvas.coords(item, *coords)
+        if item in self.items:
+            self.remove_from_index(item)
+            self.add_to_index(item, self.bounds_for(item, coords))
+    
+    def extend(self, item, *coords):
+        """Append points to a line or polygon without resending old points"""
+        self.canvas.insert(item, "end", coords)
+        if item in self.items:
+            bounds = self.items[item]
+            self.remove_from_index(item)
+            xs = coords[0::2] + (bounds[0], bounds[2])
+            ys = coords[1::2] + (bounds[1], bounds[3])
+            self.add_to_index(item, (min(xs), min(ys), max(xs), max(ys)))
+    
+    def delete(self, item):
+        """Delete one item from the canvas and the index"""
+        self.canvas.delete(item)
+        self.pinned.discard(item)
+        if item in self.items:
+            self.remove_from_index(item)
+    
+    def delete_tag(self, tag):
+        """Delete every item carrying tag from the canvas and the index"""
+        for item in self.canvas.find_withtag(tag):
+            self.pinned.discard(item)
+            if item in self.items:
+                self.remove_from_index(item)
+        self.canvas.delete(tag)
+    
+    def pin(self, item):
+        """Exempt an item from the item budget"""
+        self.pinned.add(item)
+    
+    def unpin(self, item):
+        self.pinned.discard(item)
+    
+    def clear(self):
+        """Delete every item the scene created"""
+        self.canvas.delete(self.tag)
+        self.items.clear()
+        self.grid.clear()
+        self.pinned.clear()
+    
+    def find_at(self, x, y):
+        """Return the topmost item whose bounding box contains (x, y), or None"""
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+        hits = [item for item in self.grid.get(cell, ())
+                if self.contains(self.items[item], x, y)]
+        return max(hits) if hits else None
+    
+    def find_in_region(self, x1, y1, x2, y2):
+        """Return the items whose bounding boxes overlap a rectangle"""
+        region = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        found = set()
+        for cell in self.cells_for(region):
+            for item in self.grid.get(cell, ()):
+                if item not in found and self.overlaps(self.items[item], region):
+                    found.add(item)
+        return sorted(found)
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def bounds_for(self, item, coords):
+        """Work out an item's bounding box, asking Tk only when necessary"""
+        if len(coords) >= 4:
+            xs = coords[0::2]
+            ys = coords[1::2]
+            return (min(xs), min(ys), max(xs), max(ys))
+        
+        # Text and single-point items: let Tk measure them
+        bbox = self.canvas.bbox(item)
+        if bbox:
+            return bbox
+        x, y = coords[0], coords[1]
+        return (x, y, x, y)
+    
+    def cells_for(self, bounds):
+        """Yield the grid cells a bounding box touches"""
+        x1, y1, x2, y2 = bounds
+        size = self.cell_size
+        for column in range(int(x1 // size), int(x2 // size) + 1):
+            for row in range(int(y1 // size), int(y2 // size) + 1):
+                yield (column, row)
+    
+    def add_to_index(self, item, bounds):
+        self.items[item] = bounds
+        for cell in self.cells_for(bounds):
+            self.grid.setdefault(cell, set()).add(item)
+    
+    def remove_from_index(self, item):
+        bounds = self.items.pop(item)
+        for cell in self.cells_for(bounds):
+            bucket = self.grid.get(cell)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self.grid[cell]
+    
+    def enforce_budget(self):
+        """Delete the oldest unpinned items while the scene is over its item budget"""
+        if self.max_items is None:
+            return
+        excess = len(self.items) - self.max_items
+        if excess <= 0:
+            return
+        oldest = []
+        for item in self.items:
+            if item not in self.pinned:
+                oldest.append(item)
+                if len(oldest) == excess:
+                    break
+        for item in oldest:
+            self.delete(item)
+    
+    @staticmethod
+    def contains(bounds, x, y):
+        x1, y1, x2, y2 = bounds
+        return x1 <= x <= x2 and y1 <= y <= y2
+    
+    @staticmethod
+    def overlaps(bounds, region):
+        x1, y1, x2, y2 = bounds
+        rx1, ry1, rx2, ry2 = region
+        return x1 <= rx2 and rx1 <= x2 and y1 <= ry2 and ry1 <= y2
+
+
+def simplify_polyline(points, tolerance=1.0):
+    """Simplify a list of (x, y) points with the Ramer-Douglas-Peucker algorithm
+    
+    Points closer than tolerance pixels to the line between their neighbours
+    are dropped; the first and last points are always kept.
+    """
+    if len(points) < 3:
+        return list(points)
+    
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    
+    # Iterative version so long strokes cannot hit the recursion limit
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        x1, y1 = points[start]
+        x2, y2 = points[end]
+        dx, dy = x2 - x1, y2 - y1
+        length = (dx * dx + dy * dy) ** 0.5
+        
+        farthest, max_distance = None, tolerance
+        for i in range(start + 1, end):
+            px, py = points[i]
+            if length:
+                distance = abs(dy * px - dx * py + x2 * y1 - y2 * x1) / length
+            else:
+                distance = ((px - x1) ** 2 + (py - y1) ** 2) ** 0.5
+            if distance > max_distance:
+                farthest, max_distance = i, distance
+        
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((start, farthest))
+            stack.append((farthest, end))
+    
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+class VirtualTreeview:
+    """Show a large dataset in a ttk.Treeview by materializing only visible rows
+    
+    The Treeview holds just the rows in view plus a few overscan rows.  The
+    scrollbar is driven by the view, which maps its position to an offset in
+    the underlying data and asks get_rows(start, count) for the (iid, values)
+    pairs to display.  row_count() returns the total number of rows.
+    """
+    
+    def __init__(self, tree, scrollbar, row_count, get_rows, overscan=5):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_count = row_count
+        self.get_rows = get_rows
+        self.overscan = overscan
+        
+        self.offset = 0
+        self.visible_rows = int(tree.cget("height"))
+        self.shown_iids = ()
+        
+        # The view, not the Treeview, decides what the scrollbar shows
+        self.scrollbar.config(command=self.on_scrollbar)
+        self.tree.config(yscrollcommand="")
+        
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", self.on_mouse_wheel)   # Linux
+        self.tree.bind("<Button-5>", self.on_mouse_wheel)   # Linux
+        self.tree.bind("<Configure>", self.on_resize)
+    
+    def on_scrollbar(self, action, amount, unit=None):
+        """Handle scrollbar drags and arrow/trough clicks"""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.row_count()))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+    
+    def on_mouse_wheel(self, event):
+        """Scroll three rows per wheel notch"""
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"  # Keep the Treeview from scrolling its few rows itself
+    
+    def on_resize(self, event):
+        """Show more or fewer rows when the Treeview changes height"""
+        style = ttk.Style(self.tree)
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        heading_height = 25
+        visible_rows = max(1, (event.height - heading_height) // row_height)
+        
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.refresh()
+    
+    def scroll_to(self, offset):
+        """Make the row at offset the first one shown"""
+        total = self.row_count()
+        offset = max(0, min(offset, total - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+    
+    def refresh(self):
+        """Re-read the visible window after the underlying data changed"""
+        total = self.row_count()
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        self.render()
+    
+    def refresh_row(self, iid, values):
+        """Update one row in place if it is currently materialized"""
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=values)
+    
+    def render(self):
+        """Replace the materialized rows with the current window"""
+        rows = self.get_rows(self.offset, self.visible_rows + self.overscan)
+        iids = tuple(iid for iid, values in rows)
+        
+        if iids == self.shown_iids:
+            # Same rows as before: just refresh their values
+            for iid, values in rows:
+                self.tree.item(iid, values=values)
+        else:
+            selection = self.tree.selection()
+            if self.shown_iids:
+                self.tree.delete(*self.shown_iids)
+            for iid, values in rows:
+                self.tree.insert("", "end", iid=iid, values=values)
+            
+            # Keep the selection when the selected row is still in view
+            still_shown = [iid for iid in selection if iid in iids]
+            if still_shown:
+                self.tree.selection_set(still_shown)
+            self.shown_iids = iids
+        
+        self.tree.yview_moveto(0)
+        self.update_scrollbar()
+    
+    def update_scrollbar(self):
+        total = self.row_count()
+        if total == 0:
+            self.scrollbar.set(0, 1)
+        else:
+            first = self.offset / total
+            last = min(1.0, (self.offset + self.visible_rows) / total)
+            self.scrollbar.set(first, last)
+
+
+class RecordStore:
+    """Keyed record storage with stable IDs and O(1) lookup, update and delete
+    
+    Each record gets a string ID when it is added, which is also a handy
+    Treeview iid.  Records keep their display order in a list of slots;
+    deleting a record leaves a tombstone (None) in its slot instead of
+    shifting every later record, and the slots are compacted once more
+    than half of them are tombstones.
+    """
+    
+    def __init__(self):
+        self.records = {}      # record id -> record
+        self.slots = []        # record ids in display order, None = deleted
+        self.positions = {}    # record id -> index in self.slots
+        self.tombstones = 0
+        self.next_id = 1
+    
+    def add(self, record):
+        """Store a record at the end and return its new ID"""
+        record_id = f"r{self.next_id}"
+        self.next_id += 1
+        
+        self.records[record_id] = record
+        self.positions[record_id] = len(self.slots)
+        self.slots.append(record_id)
+        return record_id
+    
+    def add_many(self, records):
+        """Store several records and return the number added"""
+        count = 0
+        for record in records:
+            self.add(record)
+            count += 1
+        return count
+    
+    def get(self, record_id):
+        return self.records[record_id]
+    
+    def update(self, record_id, record):
+        if record_id not in self.records:
+            raise KeyError(record_id)
+        self.records[record_id] = record
+    
+    def delete(self, record_id):
+        """Remove a record, leaving a tombstone in its slot"""
+        del self.records[record_id]
+        position = self.positions.pop(record_id)
+        self.slots[position] = None
+        self.tombstones += 1
+        
+        if self.tombstones > len(self.slots) // 2:
+            self.compact()
+    
+    def compact(self):
+        """Drop tombstones and renumber the slot positions"""
+        self.slots = [record_id for record_id in self.slots if record_id is not None]
+        self.positions = {record_id: position
+                          for position, record_id in enumerate(self.slots)}
+        self.tombstones = 0
+    
+    def clear(self):
+        self.records.clear()
+        self.slots.clear()
+        self.positions.clear()
+        self.tombstones = 0
+    
+    def slot_count(self):
+        """Number of slots, including tombstones (used for scrolling)"""
+        return len(self.slots)
+    
+    def window(self, start, count):
+        """Return up to count (id, record) pairs starting at slot start"""
+        rows = []
+        position = start
+        while len(rows) < count and position < len(self.slots):
+            record_id = self.slots[position]
+            if record_id is not None:
+                rows.append((record_id, self.records[record_id]))
+            position += 1
+        return rows
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def __contains__(self, record_id):
+        return record_id in self.records
+    
+    def __iter__(self):
+        """Iterate over the records in display order"""
+        for record_id in self.slots:
+            if record_id is not None:
+                yield self.records[record_id]
+
+
+class AsyncFileLoader:
+    """Read a text file on a worker thread and hand it to Tk in chunks
+    
+    The worker puts chunks on a small bounded queue; the Tk thread polls the
+    queue with after() and passes each chunk to on_chunk, so large files
+    stream into a widget while the window stays responsive.  Callbacks all
+    run on the Tk thread.
+    """
+    
+    def __init__(self, widget, filename, on_chunk, on_done,
+                 on_error=None, on_progress=None,
+                 chunk_size=256 * 1024, poll_interval=20, encoding="utf-8"):
+        self.widget = widget
+        self.filename = filename
+        self.on_chunk = on_chunk
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self.encoding = encoding
+        
+        # Bounded so a fast disk cannot run far ahead of the UI
+        self.chunks = queue.Queue(maxsize=8)
+        self.cancelled = threading.Event()
+        self.poll_id = None
+        self.total_bytes = 0
+    
+    def start(self):
+        """Start reading in the background"""
+        self.total_bytes = os.path.getsize(self.filename)
+        worker = threading.Thread(target=self.read_file, daemon=True)
+        worker.start()
+        self.poll_id = self.widget.after(self.poll_interval, self.poll)
+    
+    def cancel(self):
+        """Stop reading; no further callbacks will run"""
+        self.cancelled.set()
+        if self.poll_id is not None:
+            self.widget.after_cancel(self.poll_id)
+            self.poll_id = None
+        
+        # Unblock the worker if it is waiting on a full queue
+        try:
+            while True:
+                self.chunks.get_nowait()
+        except queue.Empty:
+            pass
+    
+    def read_file(self):
+        """Worker thread: read chunks and queue them for the Tk thread"""
+        try:
+            with open(self.filename, "r", encoding=self.encoding) as file:
+                while not self.cancelled.is_set():
+                    chunk = file.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    self.put(("chunk", chunk, file.buffer.tell()))
+            self.put(("done", None, self.total_bytes))
+        except Exception as e:
+            self.put(("error", e, 0))
+    
+    def put(self, message):
+        """Queue a message, giving up if the load is cancelled meanwhile"""
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+    
+    def poll(self):
+        """Tk thread: deliver queued chunks, then check again shortly"""
+        self.poll_id = None
+        for _ in range(self.chunks.maxsize):
+            try:
+                kind, payload, bytes_read = self.chunks.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == "chunk":
+                self.on_chunk(payload)
+                if self.on_progress:
+                    self.on_progress(bytes_read, self.total_bytes)
+            elif kind == "done":
+                self.on_done()
+                return
+            else:
+                if self.on_error:
+                    self.on_error(payload)
+                return
+            
+            if self.cancelled.is_set():
+                return
+        
+        self.poll_id = self.widget.after(self.poll_interval, self.poll)
+
+
+class LargeFileView:
+    """Read-only, memory-mapped view of a huge text file in a Text widget
+    
+    The file is mapped with mmap instead of being read into memory.  A
+    sparse line index (newline counts per block of the file) is built a few
+    blocks per idle tick, and only the lines in view are decoded and placed
+    in the Text widget as the user scrolls.  Opening a file and jumping to
+    any line costs about the same whatever the file's size.
+    """
+    
+    def __init__(self, text_widget, scrollbar, filename, encoding="utf-8",
+                 block_size=4 * 1024 * 1024, on_indexed=None):
+        self.text_widget = text_widget
+        self.scrollbar = scrollbar
+        self.filename = filename
+        self.encoding = encoding
+        self.block_size = block_size
+        self.on_indexed = on_indexed
+        
+        self.file = open(filename, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        if self.size:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = b""  # mmap cannot map an empty file
+        
+        # block_newlines[i] = number of newlines before byte i * block_size
+        self.block_newlines = [0]
+        self.indexed_bytes = 0
+        self.index_id = None
+        
+        self.first_line = 0
+        self.visible_lines = int(text_widget.cget("height"))
+        self.line_height = tkfont.Font(font=text_widget.cget("font")).metrics("linespace")
+        
+        # Swapping windows of text in and out must not pile up on the undo stack
+        self.undo = text_widget.cget("undo")
+        self.text_widget.config(undo=False)
+        self.text_widget.edit_reset()
+        
+        # Take over scrolling from the Text widget
+        self.scrollbar.config(command=self.on_scrollbar)
+        self.text_widget.config(yscrollcommand="")
+        self.bindings = {
+            "<MouseWheel>": self.on_mouse_wheel,
+            "<Button-4>": self.on_mouse_wheel,      # Linux
+            "<Button-5>": self.on_mouse_wheel,      # Linux
+            "<Up>": lambda e: self.scroll_by(-1),
+            "<Down>": lambda e: self.scroll_by(1),
+            "<Prior>": lambda e: self.scroll_by(-self.visible_lines),
+            "<Next>": lambda e: self.scroll_by(self.visible_lines),
+            "<Control-Home>": lambda e: self.scroll_to(0),
+            "<Control-End>": lambda e: self.scroll_to(self.line_count()),
+            "<Configure>": self.on_resize,
+        }
+        for sequence, handler in self.bindings.items():
+            self.text_widget.bind(sequence, self.breaking(handler))
+        
+        self.render()
+        # Start indexing on the next idle tick, so on_indexed never runs
+        # before the caller has this view in hand
+        self.index_id = self.text_widget.after_idle(self.index_step)
+    
+    @staticmethod
+    def breaking(handler):
+        """Wrap a handler so the Text widget's own scrolling doesn't run too"""
+        def wrapper(event):
+            handler(event)
+            return "break"
+        return wrapper
+    
+    def index_step(self, blocks_per_step=16):
+        """Count newlines in the next few blocks, then yield to the event loop"""
+        self.index_id = None
+        for _ in range(blocks_per_step):
+            if self.indexed_bytes >= self.size:
+                break
+            end = min(self.indexed_bytes + self.block_size, self.size)
+            newlines = self.data[self.indexed_bytes:end].count(b"\n")
+            self.block_newlines.append(self.block_newlines[-1] + newlines)
+            self.indexed_bytes = end
+        
+        self.update_scrollbar()
+        if self.on_indexed:
+            self.on_indexed(self.indexed_bytes, self.size)
+        if self.indexed_bytes < self.size:
+            self.index_id = self.text_widget.after_idle(self.index_step)
+    
+    def is_indexed(self):
+        return self.indexed_bytes >= self.size
+    
+    def line_count(self):
+        """Number of lines indexed so far (the whole file once indexing ends)"""
+        count = self.block_newlines[-1]
+        if self.is_indexed() and self.size and self.data[self.size - 1] != ord("\n"):
+            count += 1  # Last line has no trailing newline
+        return count
+    
+    def line_start(self, line):
+        """Byte offset where a (0-based) line starts"""
+        if line <= 0:
+            return 0
+        
+        # Find the block holding the line's preceding newline, then scan it
+        block = bisect.bisect_left(self.block_newlines, line) - 1
+        position = block * self.block_size
+        for _ in range(line - self.block_newlines[block]):
+            position = self.data.find(b"\n", position) + 1
+        return position
+    
+    def read_lines(self, first_line, count):
+        """Decode count lines starting at first_line"""
+        start = self.line_start(first_line)
+        end = start
+        for _ in range(count):
+            end = self.data.find(b"\n", end)
+            if end == -1:
+                end = self.size
+                break
+            end += 1
+        return self.data[start:end].decode(self.encoding, errors="replace")
+    
+    def render(self):
+        """Show the lines in view (plus one screen of overscan)"""
+        text = self.read_lines(self.first_line, self.visible_lines * 2)
+        self.text_widget.config(state="normal")
+        self.text_widget.delete("1.0", tk.END)
+        self.text_widget.insert("1.0", text)
+        self.text_widget.config(state="disabled")
+        # Swapping the window of text is not an edit to the document
+        self.text_widget.edit_modified(False)
+        self.update_scrollbar()
+    
+    def scroll_to(self, line):
+        """Make a (0-based) line the first one shown"""
+        line = max(0, min(line, self.line_count() - self.visible_lines))
+        if line != self.first_line:
+            self.first_line = line
+            self.render()
+    
+    def scroll_by(self, lines):
+        self.scroll_to(self.first_line + lines)
+    
+    def go_to_line(self, line_number):
+        """Jump to a (1-based) line number and highlight it"""
+        self.scroll_to(line_number - 1)
+        row = line_number - self.first_line
+        self.text_widget.tag_remove("current_line", "1.0", tk.END)
+        self.text_widget.tag_add("current_line", f"{row}.0", f"{row}.end")
+        self.text_widget.tag_config("current_line", background="lightyellow")
+    
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.line_count()))
+        elif action == "scroll":
+            step = self.visible_lines if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+    
+    def on_mouse_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_by(-3)
+        else:
+            self.scroll_by(3)
+    
+    def on_resize(self, event):
+        visible_lines = max(1, event.height // self.line_height)
+        if visible_lines != self.visible_lines:
+            self.visible_lines = visible_lines
+            self.render()
+    
+    def update_scrollbar(self):
+        total = self.line_count()
+        if total == 0:
+            self.scrollbar.set(0, 1)
+        else:
+            first = self.first_line / total
+            last = min(1.0, (self.first_line + self.visible_lines) / total)
+            self.scrollbar.set(first, last)
+    
+    def close(self):
+        """Release the file and give scrolling and undo back to the Text widget
+        
+        Safe to call from a <Destroy> handler: the file is released even if
+        the widgets are already gone.
+        """
+        if self.index_id is not None:
+            self.text_widget.after_cancel(self.index_id)
+            self.index_id = None
+        
+        try:
+            for sequence in self.bindings:
+                self.text_widget.unbind(sequence)
+            self.scrollbar.config(command=self.text_widget.yview)
+            self.text_widget.config(yscrollcommand=self.scrollbar.set, state="normal")
+            self.text_widget.tag_remove("current_line", "1.0", tk.END)
+            self.text_widget.delete("1.0", tk.END)
+            self.text_widget.config(undo=self.undo)
+            self.text_widget.edit_reset()
+        except tk.TclError:
+            pass  # The window is being destroyed
+        
+        if self.size:
+            self.data.close()
+        self.file.close()
+
+
+def save_text_atomically(text_widget, filename, encoding="utf-8", chunk_lines=2000):
+    """Save a Text widget's contents to filename without risking the old file
+    
+    The text is streamed out of the widget chunk_lines lines at a time into a
+    temporary file in the same directory, flushed to disk, and then moved
+    over the target with os.replace().  A crash part way through leaves the
+    original file untouched.  A symlinked target is followed, so the link
+    stays a link.  Returns the number of characters written.
+    """
+    filename = os.path.realpath(filename)
+    directory = os.path.dirname(filename)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    
+    try:
+        characters = 0
+        with os.fdopen(fd, "w", encoding=encoding) as file:
+            last_line = int(text_widget.index("end-1c").split(".")[0])
+            for start in range(1, last_line + 1, chunk_lines):
+                # The final chunk runs to "end", including the trailing newline
+                end = f"{start + chunk_lines}.0" if start + chunk_lines <= last_line else tk.END
+                chunk = text_widget.get(f"{start}.0", end)
+                file.write(chunk)
+                characters += len(chunk)
+            
+            file.flush()
+            os.fsync(file.fileno())
+        
+        # Keep the original file's permissions; mkstemp makes new files
+        # 0600, so give a new file the mode open() would have
+        if os.path.exists(filename):
+            shutil.copymode(filename, temp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    
+    return characters
+
+
+class Debouncer:
+    """Run a callback only once a burst of calls has gone quiet
+    
+    Every submit() restarts the delay, so typing "smith" quickly runs the
+    callback once with the final arguments instead of once per keystroke.
+    """
+    
+    def __init__(self, widget, callback, delay=150):
+        self.widget = widget
+        self.callback = callback
+        self.delay = delay
+        
+        self.args = ()
+        self.after_id = None
+    
+    def submit(self, *args):
+        """Remember the newest arguments and restart the delay"""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+        self.args = args
+        self.after_id = self.widget.after(self.delay, self.deliver)
+    
+    def deliver(self):
+        """Pass the newest arguments to the callback"""
+        self.after_id = None
+        args, self.args = self.args, ()
+        self.callback(*args)
+    
+    def flush(self):
+        """Run a pending call right away (e.g. when Enter is pressed)"""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.deliver()
+    
+    def cancel(self):
+        """Drop a pending call without running it"""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        self.args = ()
+
+
+class ContactSearchIndex:
+    """Word-prefix index over the text fields of a set of records
+    
+    Each field is split into lowercase words, and every word maps to the keys
+    of the records that contain it.  A query matches a record when each of
+    its words starts some word in the record, so "jo sm" finds "John Smith".
+    The words are kept sorted, so all words with a given prefix are one
+    bisect range; single adds and removes keep the list sorted in place,
+    so editing one record never re-sorts the whole vocabulary.  When a
+    query only grows, the previous results are narrowed instead of
+    searching the whole index again.
+    """
+    
+    def __init__(self, fields=("name", "email", "phone", "address"), digit_fields=("phone",)):
+        self.fields = fields
+        self.digit_fields = digit_fields
+        
+        self.postings = {}      # word -> set of record keys
+        self.record_words = {}  # record key -> tuple of words
+        self.sorted_words = []
+        self.words_dirty = False
+        
+        # Checking each earlier result beats a fresh lookup only when there
+        # are few of them
+        self.narrow_limit = 1000
+        self.last_query = None
+        self.last_results = None
+    
+    @staticmethod
+    def split_words(text):
+        """Split text into lowercase words"""
+        return WORD_PATTERN.findall(text.lower())
+    
+    def words_for(self, record):
+        """All the searchable words in a record"""
+        values = [str(record.get(field) or "") for field in self.fields]
+        words = set(self.split_words(" ".join(values)))
+        
+        # Let "3125551234" find "(312) 555-1234"
+        for field in self.digit_fields:
+            digits = NON_DIGIT_PATTERN.sub("", str(record.get(field) or ""))
+            if digits:
+                words.add(digits)
+        return tuple(words)
+    
+    def add(self, key, record):
+        """Index a record (replacing any earlier version with the same key)"""
+        if key in self.record_words:
+            self.remove(key)
+        
+        words = self.words_for(record)
+        self.record_words[key] = words
+        for word in words:
+            keys = self.postings.get(word)
+            if keys is None:
+                keys = self.postings[word] = set()
+                if not self.words_dirty:
+                    bisect.insort(self.sorted_words, word)
+            keys.add(key)
+        self.last_query = self.last_results = None
+    
+    def remove(self, key):
+        """Drop a record from the index"""
+        for word in self.record_words.pop(key, ()):
+            keys = self.postings[word]
+            keys.discard(key)
+            if not keys:
+                del self.postings[word]
+                if not self.words_dirty:
+                    del self.sorted_words[bisect.bisect_left(self.sorted_words, word)]
+        self.last_query = self.last_results = None
+    
+    def rebuild(self, items):
+        """Replace the whole index with (key, record) pairs"""
+        self.clear()
+        self.words_dirty = True  # Sort once at the end, not per word
+        for key, record in items:
+            self.add(key, record)
+        self.sort_words()
+    
+    def clear(self):
+        """Empty the index"""
+        self.postings.clear()
+        self.record_words.clear()
+        self.sorted_words = []
+        self.words_dirty = False
+        self.last_query = self.last_results = None
+    
+    def keys_with_prefix(self, prefix):
+        """Keys of all records containing a word that starts with prefix"""
+        self.sort_words()
+        start = bisect.bisect_left(self.sorted_words, prefix)
+        end = bisect.bisect_left(self.sorted_words, prefix + "\U0010ffff", start)
+        return set().union(*(self.postings[word] for word in self.sorted_words[start:end]))
+    
+    def sort_words(self):
+        """Re-sort the word list if words were added or removed"""
+        if self.words_dirty:
+            self.sorted_words = sorted(self.postings)
+            self.words_dirty = False
+    
+    def matches(self, key, terms):
+        """True if every term starts some word of the record"""
+        words = self.record_words[key]
+        return all(any(word.startswith(term) for word in words) for term in terms)
+    
+    def search(self, query):
+        """Set of keys matching query, or None when the query is empty"""
+        query = query.lower()
+        terms = self.split_words(query)
+        if not terms:
+            self.last_query = self.last_results = None
+            return None
+        
+        if (self.last_results is not None and query.startswith(self.last_query)
+                and len(self.last_results) <= self.narrow_limit):
+            # Typing more can only rule records out
+            candidates = self.last_results
+            results = {key for key in candidates if self.matches(key, terms)}
+        else:
+            # Start from the longest term, which has the fewest matches,
+            # and check the rest against each candidate's own words
+            terms.sort(key=len, reverse=True)
+            results = self.keys_with_prefix(terms[0])
+            if len(terms) > 1:
+                results = {key for key in results if self.matches(key, terms[1:])}
+        
+        self.last_query = query
+        self.last_results = results
+        return results
+
+
+class VirtualListbox:
+    """Show a large result set in a Listbox by fetching one page at a time
+    
+    Like VirtualTreeview, the Listbox holds only the rows in view and the
+    scrollbar is driven by the view.  Rows come from get_rows(start, count)
+    as (key, text) pairs, fetched page_size at a time; a few recent pages are
+    cached, so scrolling within them doesn't query again.
+    """
+    
+    def __init__(self, listbox, scrollbar, row_count, get_rows, page_size=200, cached_pages=4):
+        self.listbox = listbox
+        self.scrollbar = scrollbar
+        self.row_count = row_count
+        self.get_rows = get_rows
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+        
+        self.offset = 0
+        self.visible_rows = int(listbox.cget("height"))
+        self.pages = OrderedDict()  # page number -> list of (key, text)
+        self.shown_keys = []
+        
+        # Tk draws each Listbox line one pixel taller than the font
+        self.row_height = tkfont.Font(font=listbox.cget("font")).metrics("linespace") + 1
+        
+        # The view, not the Listbox, decides what the scrollbar shows
+        self.scrollbar.config(command=self.on_scrollbar)
+        self.listbox.config(yscrollcommand="")
+        
+        self.listbox.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.listbox.bind("<Button-4>", self.on_mouse_wheel)   # Linux
+        self.listbox.bind("<Button-5>", self.on_mouse_wheel)   # Linux
+        self.listbox.bind("<Configure>", self.on_resize)
+    
+    def on_scrollbar(self, action, amount, unit=None):
+        """Handle scrollbar drags and arrow/trough clicks"""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.row_count()))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+    
+    def on_mouse_wheel(self, event):
+        """Scroll three rows per wheel notch"""
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"  # Keep the Listbox from scrolling its few rows itself
+    
+    def on_resize(self, event):
+        """Show more or fewer rows when the Listbox changes height"""
+        border = int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness"))
+        visible_rows = max(1, (event.height - 2 * border) // self.row_height)
+        
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.refresh(reload=False)
+    
+    def scroll_to(self, offset):
+        """Make the row at offset the first one shown"""
+        total = self.row_count()
+        offset = max(0, min(offset, total - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+    
+    def refresh(self, reload=True):
+        """Redraw the view, re-fetching rows if the data may have changed"""
+        if reload:
+            self.pages.clear()
+        total = self.row_count()
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        self.render()
+    
+    def page(self, number):
+        """One page of rows, from the cache if possible"""
+        if number in self.pages:
+            self.pages.move_to_end(number)
+        else:
+            self.pages[number] = self.get_rows(number * self.page_size, self.page_size)
+            if len(self.pages) > self.cached_pages:
+                self.pages.popitem(last=False)
+        return self.pages[number]
+    
+    def rows(self, start, count):
+        """The (key, text) pairs for rows start to start + count"""
+        rows = []
+        number = start // self.page_size
+        skip = start - number * self.page_size
+        while len(rows) < count:
+            page = self.page(number)
+            rows.extend(page[skip:skip + count - len(rows)])
+            if len(page) < self.page_size:
+                break  # Last page
+            number += 1
+            skip = 0
+        return rows
+    
+    def key_at(self, index):
+        """The key of the row shown at a Listbox index"""
+        return self.shown_keys[index]
+    
+    def render(self):
+        """Replace the rows in the Listbox with the current window"""
+        selected = {self.shown_keys[i] for i in self.listbox.curselection()
+                    if i < len(self.shown_keys)}
+        
+        rows = self.rows(self.offset, self.visible_rows)
+        self.shown_keys = [key for key, text in rows]
+        self.listbox.delete(0, tk.END)
+        if rows:
+            self.listbox.insert(tk.END, *(text for key, text in rows))
+        
+        # Keep the selection when the selected row is still in view
+        for index, key in enumerate(self.shown_keys):
+            if key in selected:
+                self.listbox.selection_set(index)
+        
+        self.update_scrollbar()
+    
+    def update_scrollbar(self):
+        total = self.row_count()
+        if total == 0:
+            self.scrollbar.set(0, 1)
+        else:
+            first = self.offset / total
+            last = min(1.0, (self.offset + self.visible_rows) / total)
+            self.scrollbar.set(first, last)
+
+
+class ContactDatabase:
+    """Contact storage in an SQLite database
+    
+    Every add, update and delete touches only its own rows and is committed
+    on its own, so nothing is rewritten wholesale.  The database runs in WAL
+    mode, which makes those small commits cheap.  Searching works like
+    ContactSearchIndex: each contact's words are stored lowercase in an
+    indexed contact_words table, so a query word is one index range scan
+    and "smith" finds "John Smith".
+    """
+    
+    FIELDS = ("name", "email", "phone", "address")
+    
+    def __init__(self, filename="contacts.db"):
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS contacts (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL COLLATE NOCASE,
+                    email TEXT COLLATE NOCASE,
+                    phone TEXT,
+                    address TEXT COLLATE NOCASE
+                )""")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS contacts_name ON contacts (name)")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS contact_words (
+                    word TEXT NOT NULL,
+                    contact_id INTEGER NOT NULL,
+                    PRIMARY KEY (word, contact_id)
+                ) WITHOUT ROWID""")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS contact_words_contact ON contact_words (contact_id)")
+        
+        # Databases from before the word table existed need it filled once
+        if not self.connection.execute("SELECT 1 FROM contact_words LIMIT 1").fetchone():
+            self.reindex()
+    
+    @staticmethod
+    def words_for(contact):
+        """The same searchable words ContactSearchIndex uses for a contact"""
+        words = set(ContactSearchIndex.split_words(
+            " ".join(str(contact.get(field) or "") for field in ContactDatabase.FIELDS)))
+        digits = NON_DIGIT_PATTERN.sub("", str(contact.get("phone") or ""))
+        if digits:
+            words.add(digits)
+        return words
+    
+    def index_words(self, contact_id, contact):
+        """Replace one contact's rows in the word table (inside a transaction)"""
+        self.connection.execute("DELETE FROM contact_words WHERE contact_id = ?", (contact_id,))
+        self.connection.executemany(
+            "INSERT INTO contact_words (word, contact_id) VALUES (?, ?)",
+            [(word, contact_id) for word in self.words_for(contact)])
+    
+    def reindex(self):
+        """Rebuild the whole word table from the contacts table"""
+        with self.connection:
+            self.connection.execute("DELETE FROM contact_words")
+            rows = self.connection.execute(
+                "SELECT id, name, email, phone, address FROM contacts").fetchall()
+            for row in rows:
+                self.index_words(row[0], dict(zip(self.FIELDS, row[1:])))
+    
+    def add(self, contact):
+        """Insert a contact and return its new ID"""
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO contacts (name, email, phone, address) VALUES (?, ?, ?, ?)",
+                [contact.get(field, "") for field in self.FIELDS])
+            self.index_words(cursor.lastrowid, contact)
+        return cursor.lastrowid
+    
+    def update(self, contact_id, contact):
+        """Overwrite one contact's fields"""
+        with self.connection:
+            self.connection.execute(
+                "UPDATE contacts SET name = ?, email = ?, phone = ?, address = ? WHERE id = ?",
+                [contact.get(field, "") for field in self.FIELDS] + [contact_id])
+            self.index_words(contact_id, contact)
+    
+    def delete(self, contact_id):
+        """Remove one contact"""
+        with self.connection:
+            self.connection.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+            self.connection.execute("DELETE FROM contact_words WHERE contact_id = ?", (contact_id,))
+    
+    def get(self, contact_id):
+        """One contact as a dictionary, or None"""
+        row = self.connection.execute(
+            "SELECT name, email, phone, address FROM contacts WHERE id = ?", (contact_id,)).fetchone()
+        return dict(zip(self.FIELDS, row)) if row else None
+    
+    def where_clause(self, query):
+        """SQL condition and parameters matching every word of query
+        
+        A word matches a contact when it starts any of the contact's words.
+        Query words are split the same way as the stored ones, so they hold
+        only letters and digits and need no GLOB escaping; GLOB, unlike
+        LIKE, can use the word table's case-sensitive primary key.
+        """
+        terms = ContactSearchIndex.split_words(query)
+        if not terms:
+            return "", []
+        condition = "id IN (SELECT contact_id FROM contact_words WHERE word GLOB ?)"
+        return ("WHERE " + " AND ".join([condition] * len(terms)),
+                [term + "*" for term in terms])
+    
+    def count(self, query=""):
+        """Number of contacts matching query"""
+        where, parameters = self.where_clause(query)
+        return self.connection.execute(f"SELECT COUNT(*) FROM contacts {where}", parameters).fetchone()[0]
+    
+    def page(self, offset, limit, query=""):
+        """(id, name) pairs for one page of matching contacts, ordered by name"""
+        where, parameters = self.where_clause(query)
+        return self.connection.execute(
+            f"SELECT id, name FROM contacts {where} ORDER BY name, id LIMIT ? OFFSET ?",
+            parameters + [limit, offset]).fetchall()
+    
+    def export_json(self, filename):
+        """Write every contact to a JSON file, streaming the rows"""
+        rows = self.connection.execute(
+            "SELECT name, email, phone, address FROM contacts ORDER BY name, id")
+        with open(filename, "w", encoding="utf-8") as file:
+            file.write("[")
+            for number, row in enumerate(rows):
+                file.write(",\n  " if number else "\n  ")
+                json.dump(dict(zip(self.FIELDS, row)), file, ensure_ascii=False)
+            file.write("\n]\n")
+    
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+
+
+class ImageCache:
+    """Decode each image file once and share the resulting PhotoImage
+    
+    Images are keyed by path, modification time, file size and the requested
+    zoom/subsample, so an edited file is decoded again but an unchanged one
+    never is.  The most recently used images are kept alive up to
+    budget_bytes (about 4 bytes per pixel); past that the least recently
+    used are dropped, although an image some window still holds stays
+    shared through a weak reference.  A PhotoImage belongs to one Tk
+    interpreter, so each Tk root gets its own copies.
+    """
+    
+    def __init__(self, budget_bytes=64 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        
+        self.recent = OrderedDict()                 # key -> (image, bytes)
+        self.live = weakref.WeakValueDictionary()   # key -> image
+        self.used_bytes = 0
+    
+    def get(self, master, filename, zoom=1, subsample=1):
+        """A PhotoImage of filename scaled by zoom / subsample"""
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size, zoom, subsample, id(master.tk))
+        
+        image = self.live.get(key)
+        if image is not None and image.tk is master.tk:
+            self.remember(key, image)
+            return image
+        
+        if zoom == 1 and subsample == 1:
+            image = tk.PhotoImage(master=master, file=path)
+        else:
+            # Scale from the cached full-size image instead of decoding again
+            image = self.get(master, path)
+            if zoom != 1:
+                image = image.zoom(zoom)
+            if subsample != 1:
+                image = image.subsample(subsample)
+        
+        self.live[key] = image
+        self.remember(key, image)
+        return image
+    
+    def remember(self, key, image):
+        """Mark an image most recently used and enforce the byte budget"""
+        if key in self.recent:
+            self.recent.move_to_end(key)
+            return
+        
+        size = image.width() * image.height() * 4
+        self.recent[key] = (image, size)
+        self.used_bytes += size
+        
+        while self.used_bytes > self.budget_bytes and len(self.recent) > 1:
+            evicted_size = self.recent.popitem(last=False)[1][1]
+            self.used_bytes -= evicted_size
+    
+    def clear(self):
+        """Forget every cached image"""
+        self.recent.clear()
+        self.live.clear()
+        self.used_bytes = 0
+
+
+image_cache = ImageCache()
+
+
+def load_photo(master, filename, zoom=1, subsample=1):
+    """Load an image through the shared ImageCache"""
+    return image_cache.get(master, filename, zoom, subsample)
+
+
+class DemoHost:
+    """Run several demo windows inside a single Tk interpreter
+    
+    Starting Tcl/Tk is the slowest part of opening a demo window, so the host
+    creates one Tk root, a small launcher with a button per demo, and builds
+    each demo as a Toplevel of it (demo classes take the root as master).
+    Only one demo is open at a time; when its window is destroyed, any
+    after() callbacks it left pending are cancelled.  How long each demo
+    took to build and lay out is recorded in startup_times.
+    
+    Set the TK_PROFILE_HANDLERS environment variable to time every bound
+    handler with a HandlerProfiler; its overlay window shows the slowest
+    ones and the full report is printed on exit.  Set TK_STALL_THRESHOLD_MS
+    to run a StallWatchdog that logs the stack whenever the event loop is
+    blocked for longer than that many milliseconds.
+    """
+    
+    def __init__(self, title="Demos"):
+        self.profiler = None
+        if os.environ.get("TK_PROFILE_HANDLERS"):
+            self.profiler = HandlerProfiler()
+            self.profiler.install()
+        
+        self.root = tk.Tk()
+        self.root.title(title)
+        self.root.protocol("WM_DELETE_WINDOW", self.root.quit)
+        if self.profiler:
+            self.profiler.attach(self.root)
+        
+        # Off by default: its heartbeat would wake an idle host ten times a second
+        self.watchdog = None
+        threshold_ms = float(os.environ.get("TK_STALL_THRESHOLD_MS") or 0)
+        if threshold_ms > 0:
+            self.watchdog = StallWatchdog(self.root, threshold=threshold_ms / 1000)
+        
+        self.demos = []
+        self.sequential = True
+        self.current = None
+        self.host_after_ids = set()
+        self.startup_times = {}  # demo name -> list of seconds
+        
+        self.status = tk.Label(self.root, text="", anchor="w")
+    
+    def run(self, demos, sequential=True):
+        """Open (name, demo_class) pairs, one after another if sequential
+        
+        With a single demo the launcher stays hidden.  Returns when the last
+        demo (or the launcher) is closed.
+        """
+        self.demos = list(demos)
+        self.sequential = sequential
+        
+        for index, (name, demo_class) in enumerate(self.demos):
+            tk.Button(self.root, text=name, width=30,
+                      command=lambda i=index: self.open(i)).pack(padx=10, pady=2)
+        self.status.pack(fill="x", padx=10, pady=5)
+        if len(self.demos) == 1:
+            self.root.withdraw()
+        
+        self.open(0)
+        if self.profiler:
+            self.profiler.show_overlay(self.root)
+        if self.watchdog:
+            self.watchdog.start()
+        self.root.mainloop()
+        
+        if self.watchdog:
+            self.watchdog.stop()
+        self.close_current()
+        self.root.destroy()
+        if self.profiler:
+            self.profiler.uninstall()
+            self.profiler.dump()
+        return self.startup_times
+    
+    def open(self, index):
+        """Close the current demo and build demo number index"""
+        self.close_current()
+        name, demo_class = self.demos[index]
+        self.host_after_ids = set(self.pending_after_ids())
+        
+        start = time.perf_counter()
+        app = demo_class(self.root)
+        app.root.update_idletasks()  # Count geometry and layout too
+        elapsed = time.perf_counter() - start
+        
+        self.startup_times.setdefault(name, []).append(elapsed)
+        self.status.config(text=f"{name}: opened in {elapsed * 1000:.0f} ms")
+        
+        self.current = app
+        app.root.bind("<Destroy>", lambda e: self.on_demo_destroyed(e, app, index), add="+")
+    
+    def close_current(self):
+        """Tear down the demo that is open, if any"""
+        if self.current is not None:
+            app, self.current = self.current, None
+            if app.root.winfo_exists():
+                app.root.destroy()
+    
+    def on_demo_destroyed(self, event, app, index):
+        """Clean up after a demo window goes away"""
+        if event.widget is not app.root:
+            return  # One of the demo's child widgets
+        
+        keep = self.host_after_ids | self.host_owned_after_ids()
+        for after_id in self.pending_after_ids():
+            if after_id not in keep:
+                self.root.after_cancel(after_id)
+        
+        if self.current is not app:
+            return  # Closed by the host to switch demos
+        self.current = None
+        
+        if self.sequential and index + 1 < len(self.demos):
+            self.root.after_idle(self.open, index + 1)
+        elif len(self.demos) == 1 or self.sequential:
+            self.root.quit()
+    
+    def host_owned_after_ids(self):
+        """Current IDs of the host's own repeating timers, which re-arm every tick"""
+        owned = set()
+        if self.watchdog and self.watchdog.after_id is not None:
+            owned.add(self.watchdog.after_id)
+        if self.profiler and self.profiler.overlay_after_id is not None:
+            owned.add(self.profiler.overlay_after_id)
+        return owned
+    
+    def pending_after_ids(self):
+        """IDs of every after() callback still waiting to run"""
+        return self.root.tk.splitlist(self.root.tk.call("after", "info"))
+    
+    def print_startup_times(self):
+        """Print how long each demo took to open"""
+        for name, times in self.startup_times.items():
+            average = sum(times) / len(times)
+            print(f"{name}: opened {len(times)}x, {average * 1000:.1f} ms on average")
+
+
+class TclCallTimer:
+    """Stand-in for a Tk interpreter object that times call() and eval()
+    
+    Widgets reach Tcl through their root's tk attribute, so putting one of
+    these on the root (before other widgets are created) times every Tcl
+    command they run.  Time is added to the innermost open frame; nested
+    calls made while a call is already running are not counted twice.
+    """
+    
+    def __init__(self, tkapp):
+        self.tkapp = tkapp
+        self.depth = 0
+        self.frames = [0.0]
+    
+    def call(self, *args):
+        return self.timed(self.tkapp.call, args)
+    
+    def eval(self, script):
+        return self.timed(self.tkapp.eval, (script,))
+    
+    def timed(self, method, args):
+        if self.depth:
+            return method(*args)
+        
+        self.depth = 1
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self.depth = 0
+            self.frames[-1] += time.perf_counter() - start
+    
+    def __getattr__(self, name):
+        return getattr(self.tkapp, name)
+
+
+class HandlerProfiler:
+    """Opt-in timing of every handler bound with bind(), bind_all() or bind_class()
+    
+    install() wraps those methods, so each handler bound afterwards records
+    its call count, wall time, time spent inside Tcl calls (once the Tk root
+    has been passed to attach()) and queue delay: how much later than usual
+    the handler started relative to the event's X server timestamp.  Times
+    include any handlers nested inside.  report() lists the slowest handlers
+    and show_overlay() keeps a window of them up to date.
+    """
+    
+    def __init__(self):
+        self.stats = {}  # "handler <sequence>" -> dict of totals
+        self.timer = None
+        self.clock_offset = None
+        self.originals = None
+        self.overlay_after_id = None
+    
+    def install(self):
+        """Start wrapping handlers as they are bound"""
+        if self.originals is not None:
+            return
+        self.originals = bind, bind_all, bind_class = tk.Misc.bind, tk.Misc.bind_all, tk.Misc.bind_class
+        
+        def timed_bind(widget, sequence=None, func=None, add=None):
+            return bind(widget, sequence, self.wrap(func, sequence), add)
+        
+        def timed_bind_all(widget, sequence=None, func=None, add=None):
+            return bind_all(widget, sequence, self.wrap(func, sequence), add)
+        
+        def timed_bind_class(widget, className, sequence=None, func=None, add=None):
+            return bind_class(widget, className, sequence, self.wrap(func, sequence), add)
+        
+        tk.Misc.bind, tk.Misc.bind_all, tk.Misc.bind_class = timed_bind, timed_bind_all, timed_bind_class
+    
+    def uninstall(self):
+        """Stop wrapping newly bound handlers"""
+        if self.originals is not None:
+            tk.Misc.bind, tk.Misc.bind_all, tk.Misc.bind_class = self.originals
+            self.originals = None
+    
+    def attach(self, root):
+        """Time the Tcl calls made through root and the widgets created after it"""
+        if not isinstance(root.tk, TclCallTimer):
+            root.tk = TclCallTimer(root.tk)
+        self.timer = root.tk
+    
+    def wrap(self, func, sequence):
+        """A timed version of a bound handler"""
+        if not callable(func):
+            return func  # Tcl script or a query for the current binding
+        
+        name = f"{getattr(func, '__qualname__', repr(func))} {sequence}"
+        stats = self.stats.setdefault(name, {"calls": 0, "wall": 0.0, "max": 0.0, "tcl": 0.0,
+                                             "delay": 0.0, "max_delay": 0.0, "timed_events": 0})
+        
+        def timed(*args):
+            if args:
+                self.record_delay(stats, args[0])
+            
+            timer = self.timer
+            if timer is not None:
+                saved_depth = timer.depth
+                timer.depth = 0
+                timer.frames.append(0.0)
+            
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - start
+                stats["calls"] += 1
+                stats["wall"] += elapsed
+                stats["max"] = max(stats["max"], elapsed)
+                if timer is not None:
+                    stats["tcl"] += timer.frames.pop()
+                    timer.depth = saved_depth
+        
+        timed.__name__ = getattr(func, "__name__", "handler")
+        timed.__wrapped__ = func
+        return timed
+    
+    def record_delay(self, stats, event):
+        """Add how long an event waited in the queue, judged by event.time"""
+        event_time = getattr(event, "time", None)
+        if not isinstance(event_time, int) or event_time <= 0:
+            return  # Virtual or synthetic event without a timestamp
+        
+        # The X server clock has an unknown offset from ours; the smallest
+        # offset seen so far stands for "handled with no delay"
+        offset = time.monotonic() * 1000 - event_time
+        if self.clock_offset is None or offset < self.clock_offset:
+            self.clock_offset = offset
+        delay = (offset - self.clock_offset) / 1000
+        
+        stats["timed_events"] += 1
+        stats["delay"] += delay
+        stats["max_delay"] = max(stats["max_delay"], delay)
+    
+    def report(self, limit=15):
+        """Lines describing the handlers with the most total wall time"""
+        lines = [f"{'calls':>7} {'total ms':>9} {'mean ms':>8} {'max ms':>8} "
+                 f"{'tcl ms':>8} {'delay ms':>9}  handler"]
+        ranked = sorted(self.stats.items(), key=lambda item: item[1]["wall"], reverse=True)
+        for name, stats in ranked[:limit]:
+            if not stats["calls"]:
+                break
+            mean_delay = stats["delay"] / stats["timed_events"] if stats["timed_events"] else 0.0
+            lines.append(f"{stats['calls']:>7} {stats['wall'] * 1000:>9.1f} "
+                         f"{stats['wall'] / stats['calls'] * 1000:>8.2f} {stats['max'] * 1000:>8.2f} "
+                         f"{stats['tcl'] * 1000:>8.1f} {mean_delay * 1000:>9.1f}  {name}")
+        return lines
+    
+    def dump(self, limit=15):
+        """Print the slowest handlers"""
+        print("\n".join(self.report(limit)))
+    
+    def show_overlay(self, master, interval=1000):
+        """Open a window listing the slowest handlers, refreshed every interval ms"""
+        window = tk.Toplevel(master)
+        window.title("Handler Profile")
+        text = tk.Text(window, width=110, height=18, font=("Courier", 9), wrap="none")
+        text.pack(fill="both", expand=True)
+        
+        def refresh():
+            self.overlay_after_id = None
+            if not window.winfo_exists():
+                return
+            text.delete("1.0", tk.END)
+            text.insert("1.0", "\n".join(self.report()))
+            self.overlay_after_id = window.after(interval, refresh)
+        
+        refresh()
+        return window
+
+
+class StallWatchdog:
+    """Log the Tk thread's stack whenever the event loop stops running
+    
+    An after() heartbeat stamps the time every interval milliseconds from
+    the Tk thread, and a background thread checks the stamp.  When it is
+    more than threshold seconds old the loop is blocked, so the watchdog
+    captures the Tk thread's Python stack with sys._current_frames() and
+    logs it, once per stall.  When the heartbeat comes back, the length of
+    the stall is logged too.  Stalls are also kept in the stalls list.
+    """
+    
+    def __init__(self, widget, threshold=0.5, interval=100, logger=None):
+        self.widget = widget
+        self.threshold = threshold
+        self.interval = interval
+        self.logger = logger or logging.getLogger(__name__)
+        
+        self.tk_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.stalled = False
+        self.stalls = []  # dicts with the stack and how long the loop was blocked
+        
+        self.after_id = None
+        self.stopping = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        """Start the heartbeat and the watchdog thread"""
+        self.last_beat = time.monotonic()
+        self.after_id = self.widget.after(self.interval, self.beat)
+        self.thread = threading.Thread(target=self.watch, name="tk-stall-watchdog", daemon=True)
+        self.thread.start()
+    
+    def beat(self):
+        """Heartbeat, run by the event loop on the Tk thread"""
+        now = time.monotonic()
+        if self.stalled:
+            blocked = now - self.last_beat
+            self.stalls[-1]["blocked_s"] = round(blocked, 3)
+            self.logger.warning("Tk event loop resumed after being blocked for %.2f s", blocked)
+            self.stalled = False
+        
+        self.last_beat = now
+        self.after_id = self.widget.after(self.interval, self.beat)
+    
+    def watch(self):
+        """Watchdog thread: report a heartbeat that has gone quiet"""
+        while not self.stopping.wait(self.interval / 1000):
+            blocked = time.monotonic() - self.last_beat
+            if blocked <= self.threshold or self.stalled:
+                continue
+            
+            frame = sys._current_frames().get(self.tk_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "(no Python frames)\n"
+            self.stalls.append({"blocked_s": round(blocked, 3), "stack": stack})
+            self.stalled = True
+            self.logger.warning("Tk event loop blocked for %.2f s; Tk thread is at:\n%s",
+                                blocked, stack.rstrip())
+    
+    def stop(self):
+        """Stop the heartbeat and the watchdog thread"""
+        self.stopping.set()
+        if self.after_id is not None:
+            try:
+                self.widget.after_cancel(self.after_id)
+            except tk.TclError:
+                pass  # Widget already destroyed
+            self.after_id = None
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
+class EventBus:
+    """Typed virtual events that carry payloads, postable from any thread
+    
+    Tk virtual events carry no data, so post(event_type, payload) appends
+    the payload to that event type's queue and fires the virtual event once
+    per burst; the Tk thread then hands every queued payload, in order, to
+    the handlers registered with subscribe().  Nothing is overwritten no
+    matter how many payloads are in flight.  Other threads never touch Tk:
+    their posts are picked up by a poll on the Tk thread every
+    poll_interval milliseconds.  Each drain handles at most max_batch
+    payloads before yielding to the event loop.  Polling stops when the
+    widget is destroyed.
+    """
+    
+    def __init__(self, widget, poll_interval=20, max_batch=500):
+        self.widget = widget
+        self.poll_interval = poll_interval
+        self.max_batch = max_batch
+        
+        self.tk_thread_id = threading.get_ident()
+        self.payload_types = {}  # event type -> type every payload must be
+        self.handlers = {}       # event type -> list of callables
+        self.queues = {}         # event type -> deque of payloads
+        self.wake_pending = {}   # event type -> virtual event already fired
+        self.posted_from_threads = False
+        
+        self.after_id = self.widget.after(self.poll_interval, self.poll)
+        self.widget.bind("<Destroy>", self.on_destroy, add="+")
+    
+    def register(self, event_type, payload_type=object):
+        """Declare an event type such as "<<DataEvent>>" and its payload type"""
+        registered = self.payload_types.get(event_type)
+        if registered is not None:
+            if registered is not payload_type:
+                raise ValueError(f"{event_type} is already registered with payload type "
+                                 f"{registered.__name__}")
+            return
+        self.payload_types[event_type] = payload_type
+        self.handlers[event_type] = []
+        self.queues[event_type] = deque()
+        self.wake_pending[event_type] = False
+        self.widget.bind(event_type, lambda event: self.drain(event_type), add="+")
+    
+    def subscribe(self, event_type, handler):
+        """Call handler(payload) for every payload posted as event_type"""
+        if event_type not in self.handlers:
+            raise KeyError(f"unregistered event type {event_type}")
+        self.handlers[event_type].append(handler)
+    
+    def post(self, event_type, payload=None):
+        """Queue a payload for delivery on the Tk thread (safe from any thread)"""
+        payload_type = self.payload_types.get(event_type)
+        if payload_type is None:
+            raise KeyError(f"unregistered event type {event_type}")
+        if payload is not None and not isinstance(payload, payload_type):
+            raise TypeError(f"{event_type} payloads must be {payload_type.__name__}, "
+                            f"not {type(payload).__name__}")
+        
+        self.queues[event_type].append(payload)
+        if threading.get_ident() == self.tk_thread_id:
+            self.wake(event_type)
+        else:
+            self.posted_from_threads = True
+    
+    def wake(self, event_type):
+        """Fire the virtual event unless one is already on its way"""
+        if not self.wake_pending[event_type]:
+            self.wake_pending[event_type] = True
+            self.widget.event_generate(event_type, when="tail")
+    
+    def poll(self):
+        """Notice payloads posted by other threads"""
+        if self.posted_from_threads:
+            self.posted_from_threads = False
+            for event_type, payloads in self.queues.items():
+                if payloads:
+                    self.wake(event_type)
+        self.after_id = self.widget.after(self.poll_interval, self.poll)
+    
+    def drain(self, event_type):
+        """Deliver queued payloads of one type to its handlers, in order"""
+        self.wake_pending[event_type] = False
+        payloads = self.queues[event_type]
+        handlers = self.handlers[event_type]
+        
+        for _ in range(min(len(payloads), self.max_batch)):
+            payload = payloads.popleft()
+            for handler in handlers:
+                handler(payload)
+        
+        if payloads:
+            self.wake(event_type)  # The rest after other events get a turn
+    
+    def pending(self, event_type):
+        """Number of payloads waiting to be delivered"""
+        return len(self.queues.get(event_type, ()))
+    
+    def on_destroy(self, event):
+        if event.widget is self.widget:  # Not one of its children
+            self.close()
+    
+    def close(self):
+        """Stop polling for posts from other threads"""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+
+class TimerHandle:
+    """A timer scheduled on a TimerWheel; cancel() stops it"""
+    
+    def __init__(self, deadline, period, callback, args):
+        self.deadline = deadline
+        self.period = period
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+    
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """Many timers driven by a single after() callback
+    
+    Timers are kept in a heap ordered by absolute deadline (time.monotonic()),
+    and only one after() is ever pending: the one for the earliest deadline.
+    When it fires, every timer due within the same tick runs in that one
+    callback.  Repeating timers advance their deadline by whole periods from
+    the previous deadline rather than from when they ran, so handler run time
+    doesn't make the period drift.
+    """
+    
+    def __init__(self, widget, tick=10):
+        self.widget = widget
+        self.tick = tick / 1000
+        
+        self.heap = []  # (deadline, sequence number, handle)
+        self.sequence = 0
+        self.after_id = None
+        self.armed_for = None
+    
+    def call_later(self, delay_ms, callback, *args):
+        """Run callback(*args) once, delay_ms from now"""
+        return self.add(TimerHandle(time.monotonic() + delay_ms / 1000, None, callback, args))
+    
+    def call_every(self, period_ms, callback, *args):
+        """Run callback(*args) every period_ms, starting one period from now"""
+        period = period_ms / 1000
+        return self.add(TimerHandle(time.monotonic() + period, period, callback, args))
+    
+    def add(self, handle):
+        self.push(handle)
+        self.arm()
+        return handle
+    
+    def push(self, handle):
+        self.sequence += 1
+        heapq.heappush(self.heap, (handle.deadline, self.sequence, handle))
+    
+    def arm(self):
+        """Make sure the one after() is set for the earliest deadline"""
+        while self.heap and self.heap[0][2].cancelled:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return
+        
+        deadline = self.heap[0][0]
+        if self.after_id is not None:
+            if self.armed_for <= deadline:
+                return
+            self.widget.after_cancel(self.after_id)
+        
+        delay_ms = max(0, int((deadline - time.monotonic()) * 1000))
+        self.armed_for = deadline
+        self.after_id = self.widget.after(delay_ms, self.run_due)
+    
+    def run_due(self):
+        """Run every timer due within this tick, then re-arm"""
+        self.after_id = None
+        now = time.monotonic()
+        
+        due = []
+        while self.heap and self.heap[0][0] <= now + self.tick:
+            handle = heapq.heappop(self.heap)[2]
+            if not handle.cancelled:
+                due.append(handle)
+        
+        for handle in due:
+            if handle.period is not None:
+                # Stay on the original schedule, skipping periods that were missed
+                handle.deadline += handle.period
+                if handle.deadline <= now:
+                    missed = int((now - handle.deadline) / handle.period) + 1
+                    handle.deadline += missed * handle.period
+                self.push(handle)
+            if not handle.cancelled:
+                handle.callback(*handle.args)
+        
+        self.arm()
+    
+    def pending(self):
+        """Number of timers still waiting to run"""
+        return sum(1 for deadline, sequence, handle in self.heap if not handle.cancelled)
+    
+    def cancel_all(self):
+        """Cancel every timer and the pending after()"""
+        for deadline, sequence, handle in self.heap:
+            handle.cancel()
+        self.heap.clear()
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+
+class EventChain:
+    """A declarative multi-stage event chain run on a TimerWheel
+    
+    Each stage waits its delay after the previous stage finished and then
+    runs all of its steps together.  A step is either a virtual event name,
+    which is generated on the wheel's widget, or a callable.  Because every
+    wait is one cancellable timer there are no pending lambdas to leak, and
+    cancel() stops the chain wherever it is.  After each run, latencies holds
+    (stage name, ms waited, ms spent running the stage's handlers).
+    """
+    
+    def __init__(self, timers, on_complete=None, on_cancel=None):
+        self.timers = timers
+        self.on_complete = on_complete
+        self.on_cancel = on_cancel
+        
+        self.stages = []  # (name, delay_ms, steps)
+        self.index = 0
+        self.handle = None
+        self.stage_ready = 0.0
+        self.latencies = []
+    
+    def step(self, *steps, delay=0, name=None):
+        """Add a stage that runs every one of steps, delay ms after the last stage"""
+        if name is None:
+            name = " + ".join(step if isinstance(step, str) else step.__name__ for step in steps)
+        self.stages.append((name, delay, steps))
+        return self
+    
+    def running(self):
+        return self.handle is not None
+    
+    def start(self):
+        """Run the chain from the first stage, restarting it if already running"""
+        if self.running():
+            self.handle.cancel()
+        self.index = 0
+        self.latencies = []
+        self.schedule_stage()
+    
+    def schedule_stage(self):
+        name, delay, steps = self.stages[self.index]
+        self.stage_ready = time.perf_counter()
+        self.handle = self.timers.call_later(delay, self.run_stage)
+    
+    def run_stage(self):
+        name, delay, steps = self.stages[self.index]
+        started = time.perf_counter()
+        for step in steps:
+            if isinstance(step, str):
+                self.timers.widget.event_generate(step)
+            else:
+                step()
+            if self.handle is None:
+                return  # a step cancelled the chain
+        finished = time.perf_counter()
+        self.latencies.append((name, (started - self.stage_ready) * 1000, (finished - started) * 1000))
+        
+        self.index += 1
+        if self.index < len(self.stages):
+            self.schedule_stage()
+        else:
+            self.handle = None
+            if self.on_complete:
+                self.on_complete(self)
+    
+    def cancel(self):
+        """Stop the chain before its next stage; returns False if it wasn't running"""
+        if not self.running():
+            return False
+        self.handle.cancel()
+        self.handle = None
+        if self.on_cancel:
+            self.on_cancel(self)
+        return True
+    
+    def report(self):
+        """One line per completed stage: wait and run time"""
+        return [f"{name}: waited {waited:.0f} ms, ran {ran:.1f} ms"
+                for name, waited, ran in self.latencies]
+
+
+class WindowGeometry:
+    """Cached size, position, state and focus of a toplevel window
+    
+    The values are kept current by the window's own <Configure>, <Map>,
+    <Unmap>, <FocusIn> and <FocusOut> events instead of polling geometry(),
+    state() and focus_get().  Changes from one burst of events are published
+    together from a single after_idle, and subscribers hear only about the
+    fields whose value really changed, so an idle window costs nothing.
+    Bindings are added with add="+", so create this after any plain bind()
+    calls on the same events.
+    """
+    
+    FIELDS = ("size", "position", "state", "focused")
+    
+    def __init__(self, window):
+        self.window = window
+        self.size = None
+        self.position = None
+        self.state = None
+        self.focused = None
+        
+        self.listeners = []
+        self.published = dict.fromkeys(self.FIELDS)
+        self.idle_id = None
+        
+        window.bind("<Configure>", self.on_configure, add="+")
+        window.bind("<Map>", self.on_map, add="+")
+        window.bind("<Unmap>", self.on_map, add="+")
+        window.bind("<FocusIn>", lambda event: self.update(focused=True), add="+")
+        window.bind("<FocusOut>", lambda event: self.update(focused=False), add="+")
+    
+    def subscribe(self, callback):
+        """Call callback(geometry, changed_fields) whenever something changes"""
+        self.listeners.append(callback)
+    
+    def on_configure(self, event):
+        if event.widget is not self.window:
+            return  # children's Configure events reach the toplevel too
+        size = (event.width, event.height)
+        if size != self.size:
+            # Maximizing shows up as a resize, not as a Map
+            self.update(size=size, position=(event.x, event.y), state=self.window.state())
+        else:
+            self.update(position=(event.x, event.y))
+    
+    def on_map(self, event):
+        if event.widget is self.window:
+            self.update(state=self.window.state())
+    
+    def update(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+        if self.idle_id is None:
+            self.idle_id = self.window.after_idle(self.publish)
+    
+    def publish(self):
+        self.idle_id = None
+        changed = {name for name in self.FIELDS
+                   if getattr(self, name) != self.published[name]}
+        if not changed:
+            return  # e.g. focus moved between two widgets of this window
+        for name in changed:
+            self.published[name] = getattr(self, name)
+        for callback in self.listeners:
+            callback(self, changed)
+
+
+class ResizeCoalescer:
+    """Turn the flood of <Configure> events from a live resize into two callbacks
+    
+    Only the window's own events count (children's Configure events reach the
+    toplevel too), moves that keep the size are ignored, and only the newest
+    size is kept.  on_settled(width, height) runs once the size has been still
+    for quiet ms; the optional on_preview(width, height) runs at most once
+    every preview_interval ms while the drag is going on.
+    """
+    
+    def __init__(self, window, on_settled, on_preview=None, quiet=200, preview_interval=100):
+        self.window = window
+        self.size = None
+        
+        self.on_settled = on_settled
+        self.settled = Debouncer(window, self.deliver_settled, quiet)
+        self.preview = None
+        if on_preview is not None:
+            self.preview = MotionCoalescer(window, lambda size: on_preview(*size), preview_interval)
+        
+        window.bind("<Configure>", self.on_configure, add="+")
+    
+    def on_configure(self, event):
+        if event.widget is not self.window:
+            return
+        size = (event.width, event.height)
+        if size == self.size:
+            return  # moved, not resized
+        self.size = size
+        if self.preview is not None:
+            self.preview.submit(size)
+        self.settled.submit(*size)
+    
+    def deliver_settled(self, width, height):
+        """Report the final size; a preview still pending would be stale"""
+        if self.preview is not None:
+            self.preview.cancel()
+        self.on_settled(width, height)
+    
+    def cancel(self):
+        """Drop any pending preview or settled call"""
+        if self.preview is not None:
+            self.preview.cancel()
+        self.settled.cancel()
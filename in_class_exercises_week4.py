@@ -19,8 +19,11 @@ import json
 import csv
 from pathlib import Path
 import random
+import heapq
 import time
 from datetime import datetime
+from gui_helpers import (ContactDatabase, ContactSearchIndex, Debouncer, LargeFileView,
+                         VirtualListbox)
 
 
 # ============================================================================
@@ -248,6 +251,7 @@ class TextEditor:
         # TODO: Initialize editor state
         self.current_file = None
         self.is_modified = False
+        self.large_view = None  # Set while a large file is shown read-only
         
         self.setup_widgets()
         self.setup_menu()
@@ -258,14 +262,14 @@ class TextEditor:
         self.text_area = tk.Text(self.root, font=("Courier", 11), undo=True)
         
         # Add scrollbars
-        v_scrollbar = tk.Scrollbar(self.root, orient="vertical", command=self.text_area.yview)
+        self.v_scrollbar = tk.Scrollbar(self.root, orient="vertical", command=self.text_area.yview)
         h_scrollbar = tk.Scrollbar(self.root, orient="horizontal", command=self.text_area.xview)
         
-        self.text_area.config(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.text_area.config(yscrollcommand=self.v_scrollbar.set, xscrollcommand=h_scrollbar.set)
         
         # Pack widgets
         self.text_area.pack(side="left", fill="both", expand=True)
-        v_scrollbar.pack(side="right", fill="y")
+        self.v_scrollbar.pack(side="right", fill="y")
         h_scrollbar.pack(side="bottom", fill="x")
         
         # TODO: Create status bar
@@ -289,6 +293,8 @@ class TextEditor:
         file_menu.add_command(label="Save", command=self.save_file)
         file_menu.add_command(label="Save As", command=self.save_as_file)
         file_menu.add_separator()
+        file_menu.add_command(label="Open Large File (Read-Only)", command=self.open_large_file)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.exit_application)
         
         # Edit menu
@@ -302,12 +308,12 @@ class TextEditor:
     
     def new_file(self):
         """Create new file"""
-        # TODO: Check for unsaved changes, then clear text area
+        # TODO: Check for unsaved changes, call close_large_view(), then clear text area
         pass  # Students implement this
     
     def open_file(self):
         """Open file dialog and load file"""
-        # TODO: Use filedialog to select and open file
+        # TODO: Use filedialog to select a file, call close_large_view(), then load it
         pass  # Students implement this
     
     def save_file(self):
@@ -315,6 +321,26 @@ class TextEditor:
         # TODO: Save to current file or prompt for filename
         pass  # Students implement this
     
+    def open_large_file(self):
+        """Show a very large file read-only without loading it into memory"""
+        filename = filedialog.askopenfilename(title="Open Large File (Read-Only)",
+                                              filetypes=[("Text files", "*.txt *.log"),
+                                                         ("All files", "*.*")])
+        if filename:
+            self.close_large_view()
+            try:
+                self.large_view = LargeFileView(self.text_area, self.v_scrollbar, filename)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not open file:\n{e}")
+                return
+            self.status_bar.config(text=f"Read-only: {Path(filename).name}")
+    
+    def close_large_view(self):
+        """Leave large file mode (call this before loading a normal file)"""
+        if self.large_view:
+            self.large_view.close()
+            self.large_view = None
+    
     def save_as_file(self):
         """Save file with new name"""
         # TODO: Use filedialog to get new filename and save
@@ -342,6 +368,9 @@ class TextEditor:
     
     def on_text_change(self, event):
         """Handle text changes"""
+        if self.large_view:
+            return  # The large file view is read-only; nothing was changed
+        
         # TODO: Mark file as modified and update title
         pass  # Students implement this
     
@@ -352,7 +381,7 @@ class TextEditor:
     
     def exit_application(self):
         """Exit the application"""
-        # TODO: Check for unsaved changes before exiting
+        # TODO: Check for unsaved changes, call close_large_view(), then exit
         pass  # Students implement this
     
     def run(self):
@@ -373,6 +402,8 @@ class ContactManager:
     - Display contacts in a list
     - Save/load contacts from JSON file
     - Form validation
+    - Keep search current by calling the search index hooks
+      (contact_added, contact_changed, contact_removed, index_contacts)
     """
     
     def __init__(self):
@@ -384,6 +415,13 @@ class ContactManager:
         self.contacts = []
         self.current_contact_index = None
         
+        # Search: an index over every field, queried once typing pauses
+        self.search_index = ContactSearchIndex()
+        self.contacts_by_key = {}  # Search index key -> contact dict
+        self.search_debouncer = Debouncer(self.root, self.run_search)
+        self.max_results = 1000
+        self.visible_contacts = []  # Listbox row -> contact dict shown in that row
+        
         self.setup_widgets()
         self.load_contacts()
     
@@ -405,6 +443,9 @@ class ContactManager:
         search_entry = tk.Entry(search_frame, textvariable=self.search_var)
         search_entry.pack(side="left", fill="x", expand=True, padx=5)
         search_entry.bind("<KeyRelease>", self.on_search)
+        search_entry.bind("<Return>", lambda e: self.search_debouncer.flush())
+        self.search_status = tk.Label(left_panel, text="", anchor="w")
+        self.search_status.pack(fill="x")
         
         # Contact listbox
         self.contact_listbox = tk.Listbox(left_panel)
@@ -470,17 +511,71 @@ class ContactManager:
     
     def on_contact_select(self, event):
         """Handle contact selection"""
-        # TODO: Populate form with selected contact data
+        # TODO: Populate form with selected contact data.
+        #       The list shows search results, so look the row up in
+        #       self.visible_contacts (row -> contact dict), not self.contacts
         pass  # Students implement this
     
     def on_search(self, event):
         """Handle search input"""
-        # TODO: Filter contacts based on search term
-        pass  # Students implement this
+        # Wait for a pause in typing instead of searching on every key
+        self.search_debouncer.submit(self.search_var.get())
+    
+    # Search index hooks: call these whenever self.contacts changes.  The
+    # index is keyed on each contact dict itself, so deleting one contact
+    # doesn't shift the others, and each hook only touches its own contact.
+    
+    def contact_added(self, contact):
+        """Call after appending a new contact dict to self.contacts"""
+        self.search_index.add(id(contact), contact)
+        self.contacts_by_key[id(contact)] = contact
+        self.run_search(self.search_var.get())
+    
+    def contact_changed(self, contact):
+        """Call after editing a contact dict in place (e.g. contact.update(data))"""
+        self.search_index.add(id(contact), contact)  # Replaces the old words
+        self.run_search(self.search_var.get())
+    
+    def contact_removed(self, contact):
+        """Call after removing a contact dict from self.contacts"""
+        self.search_index.remove(id(contact))
+        self.contacts_by_key.pop(id(contact), None)
+        self.run_search(self.search_var.get())
+    
+    def index_contacts(self):
+        """Call after replacing self.contacts wholesale (e.g. after loading a file)"""
+        self.contacts_by_key = {id(contact): contact for contact in self.contacts}
+        self.search_index.rebuild(self.contacts_by_key.items())
+        self.run_search(self.search_var.get())
+    
+    def run_search(self, query):
+        """Show the contacts matching the search text"""
+        matches = self.search_index.search(query)
+        if matches is None:
+            total = len(self.contacts)
+            self.visible_contacts = self.contacts[:self.max_results]
+        else:
+            total = len(matches)
+            contacts = (self.contacts_by_key[key] for key in matches)
+            self.visible_contacts = heapq.nsmallest(
+                self.max_results, contacts, key=lambda contact: contact.get("name", "").lower())
+        
+        # One insert call for the whole page of names
+        self.contact_listbox.delete(0, tk.END)
+        names = [contact.get("name", "") for contact in self.visible_contacts]
+        if names:
+            self.contact_listbox.insert(tk.END, *names)
+        
+        if total > len(self.visible_contacts):
+            self.search_status.config(text=f"Showing {len(self.visible_contacts):,} of {total:,} matches")
+        else:
+            self.search_status.config(text=f"{total:,} contacts" if matches is None else f"{total:,} matches")
     
     def update_contact_list(self):
         """Update the contact listbox"""
-        # TODO: Refresh the contact list display
+        # TODO: Refresh the contact list display by calling
+        #       self.run_search(self.search_var.get()), which fills the
+        #       listbox and self.visible_contacts for the current search
         pass  # Students implement this
     
     def validate_contact_data(self, data):
@@ -502,6 +597,142 @@ class ContactManager:
         self.root.mainloop()
 
 
+class SQLiteContactManager(ContactManager):
+    """
+    Exercise 4 (alternative): Contact manager backed by an SQLite database
+    
+    Instead of loading a JSON file into a list and rewriting it on every
+    save, each add, update or delete writes one row.  The Listbox only asks
+    the database for the page of contacts in view, so startup time does not
+    depend on how many contacts there are.
+    """
+    
+    def __init__(self, db_filename="contacts.db"):
+        self.db = ContactDatabase(db_filename)
+        self.query = ""
+        self.match_count = 0
+        self.current_contact_id = None
+        
+        super().__init__()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+    
+    def setup_widgets(self):
+        """Setup widgets, with a paged view over the database"""
+        super().setup_widgets()
+        
+        scrollbar = tk.Scrollbar(self.contact_listbox.master)
+        scrollbar.pack(side="right", fill="y", before=self.contact_listbox)
+        self.list_view = VirtualListbox(self.contact_listbox, scrollbar,
+                                        lambda: self.match_count, self.get_page)
+    
+    def get_page(self, start, count):
+        """One page of (id, name) rows for the current search"""
+        return self.db.page(start, count, self.query)
+    
+    def form_data(self):
+        """The contact described by the form fields"""
+        return {field: var.get().strip() for field, var in self.form_vars.items()}
+    
+    def add_contact(self):
+        """Add new contact"""
+        data = self.form_data()
+        if self.validate_contact_data(data):
+            self.current_contact_id = self.db.add(data)
+            self.update_contact_list()
+    
+    def update_contact(self):
+        """Update selected contact"""
+        if self.current_contact_id is None:
+            messagebox.showinfo("Update", "Select a contact to update")
+            return
+        
+        data = self.form_data()
+        if self.validate_contact_data(data):
+            self.db.update(self.current_contact_id, data)
+            self.update_contact_list()
+    
+    def delete_contact(self):
+        """Delete selected contact"""
+        if self.current_contact_id is None:
+            messagebox.showinfo("Delete", "Select a contact to delete")
+            return
+        
+        if messagebox.askyesno("Delete", "Delete this contact?"):
+            self.db.delete(self.current_contact_id)
+            self.clear_form()
+            self.update_contact_list()
+    
+    def clear_form(self):
+        """Clear form fields"""
+        for var in self.form_vars.values():
+            var.set("")
+        self.current_contact_id = None
+        self.contact_listbox.selection_clear(0, tk.END)
+    
+    def on_contact_select(self, event):
+        """Handle contact selection"""
+        selection = self.contact_listbox.curselection()
+        if not selection:
+            return
+        
+        self.current_contact_id = self.list_view.key_at(selection[0])
+        contact = self.db.get(self.current_contact_id) or {}
+        for field, var in self.form_vars.items():
+            var.set(contact.get(field) or "")
+    
+    def index_contacts(self):
+        """The database keeps its own indexes"""
+        self.update_contact_list()
+    
+    def run_search(self, query):
+        """Show the contacts matching the search text"""
+        self.query = query
+        self.list_view.offset = 0
+        self.update_contact_list()
+    
+    def update_contact_list(self):
+        """Update the contact listbox"""
+        self.match_count = self.db.count(self.query)
+        self.list_view.refresh()
+        
+        label = "matches" if self.query.strip() else "contacts"
+        self.search_status.config(text=f"{self.match_count:,} {label}")
+    
+    def validate_contact_data(self, data):
+        """Validate contact data"""
+        if not data["name"]:
+            messagebox.showerror("Invalid Contact", "Name is required")
+            return False
+        if data["email"] and "@" not in data["email"]:
+            messagebox.showerror("Invalid Contact", "Email address must contain @")
+            return False
+        return True
+    
+    def load_contacts(self):
+        """Show the contacts already in the database"""
+        self.update_contact_list()
+    
+    def save_contacts(self):
+        """Export the contacts to a JSON file (changes are saved as they are made)"""
+        filename = filedialog.asksaveasfilename(
+            title="Export Contacts",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        
+        if filename:
+            try:
+                self.db.export_json(filename)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not export contacts:\n{e}")
+    
+    def close(self):
+        """Close the database and the window"""
+        self.search_debouncer.cancel()
+        self.db.close()
+        self.root.destroy()
+
+
 # ============================================================================
 # EXERCISE 5: MEMORY GAME
 # ============================================================================
@@ -742,7 +973,8 @@ def run_exercise(exercise_number):
         3: TextEditor,
         4: ContactManager,
         5: MemoryGame,
-        6: DataVisualizationTool
+        6: DataVisualizationTool,
+        7: SQLiteContactManager
     }
     
     if exercise_number in exercises:
@@ -762,13 +994,14 @@ def main():
     print("4. Contact Manager")
     print("5. Memory Game")
     print("6. Data Visualization Tool")
+    print("7. Contact Manager (SQLite storage)")
     print()
     
     try:
-        choice = int(input("Enter exercise number (1-6): "))
+        choice = int(input("Enter exercise number (1-7): "))
         run_exercise(choice)
     except ValueError:
-        print("Invalid input. Please enter a number between 1 and 6.")
+        print("Invalid input. Please enter a number between 1 and 7.")
     except KeyboardInterrupt:
         print("\nGoodbye!")
 
@@ -803,6 +1036,8 @@ Exercise 4 - Contact Manager:
 - Use list of dictionaries for contact storage
 - Implement JSON serialization for persistence
 - Add input validation for email format
+- SQLiteContactManager shows the sqlite3 alternative: one-row writes and
+  a Listbox that fetches one page of contacts at a time
 
 Exercise 5 - Memory Game:
 - Use 2D list for card state
@@ -1,23 +1,27 @@
-from tkinter import Tk, Label, PhotoImage, Button, Entry, Text
-from tkinter import BOTTOM, LEFT, RIGHT, RIDGE, RAISED, END, BOTH
+# tkinter is imported inside each demo, so importing this module is cheap
+# and opens no windows; run a demo with run_demo() or from the menu in main()
 from time import strftime, localtime, strptime
-from tkinter.messagebox import showinfo
 
 
 def helloWorld(msg = "Hello GUI World"):
+    from tkinter import Tk, Label
     root = Tk()
     helloWorld = Label(master=root,text=msg, height=480,width=640)
     helloWorld.pack()
     root.mainloop()
 
 def helloImage():
+    from tkinter import Tk, Label
+    from gui_helpers import load_photo
     root = Tk()
-    pic = PhotoImage(file="images\halloween01.png")
+    pic = load_photo(root, "images/halloween01.png")
     halloweenLabel = Label(master=root, image=pic, width=640,height=480)
     halloweenLabel.pack()
     root.mainloop()
 
 def multiPack():
+    from tkinter import Tk, Label, BOTTOM, LEFT, RIGHT, RIDGE
+    from gui_helpers import load_photo
     root = Tk()
     textLabel = Label(master=root, 
                     font=('Helvetica', 16, 'bold italic'),           
@@ -27,8 +31,9 @@ def multiPack():
                     text='It\'s the most wonderful time of the year!')
     textLabel.pack(side=BOTTOM)    
 
-    halloween01 = PhotoImage(file='images/halloween01.png')
-    halloween02 = PhotoImage(file='images/halloween02.png')
+    # Decoded once and shared, however many windows show them
+    halloween01 = load_photo(root, 'images/halloween01.png')
+    halloween02 = load_photo(root, 'images/halloween02.png')
 
     halloween01Label = Label(root,
                    borderwidth=15,  
@@ -42,9 +47,8 @@ def multiPack():
 
     root.mainloop()
 
-multiPack()
-
 def non_functioning_calculator():
+    from tkinter import Tk, Label, RAISED
     root = Tk()
     labels = [['1', '2', '3'],     
             ['4', '5', '6'],     
@@ -63,6 +67,7 @@ def non_functioning_calculator():
 
 def clicked():
     'prints day and time info'
+    from tkinter.messagebox import showinfo
     time = strftime('Day:  %d %b %Y\nTime: %H:%M:%S %p\n',
                     localtime())
     #print(time)
@@ -70,6 +75,7 @@ def clicked():
 
 
 def buttonIntro():
+    from tkinter import Tk, Button
     root = Tk()
     button = Button(root,
                     text='Click it',   
@@ -78,6 +84,7 @@ def buttonIntro():
     root.mainloop()
 
 def double(num):
+    from tkinter.messagebox import showinfo
     try:
         number1 = eval(num)
         showinfo("Function Double", message="{} doubled = {}".format(number1, number1*2))
@@ -86,6 +93,7 @@ def double(num):
         showinfo(message="You can only add numbers!")
 
 def functioning_calculator():
+    from tkinter import Tk, Button, RAISED
     root = Tk()
     labels = [['1', '2', '3'],     
             ['4', '5', '6'],     
@@ -103,15 +111,16 @@ def functioning_calculator():
             button.grid(row=r, column=c)
     root.mainloop()
 
-functioning_calculator()
-
 def compute():
+    from tkinter import END
+    from tkinter.messagebox import showinfo
     date = dateEnt.get()
     weekday = strftime('%A', strptime(date, '%b %d, %Y'))
     showinfo(message = '{} was a {}'.format(date, weekday))
     dateEnt.delete(0, END)
 
 def date_compute():
+    from tkinter import Tk, Label, Entry, Button
     root = Tk()
     label = Label(root, text='Enter date')
     label.grid(row=0, column=0)
@@ -130,6 +139,7 @@ def record(event):
 
 
 def keyboard_events():
+    from tkinter import Tk, Text, BOTH
     root = Tk()
     text = Text(root,
                 width=20,  # set width to 20 characters
@@ -140,4 +150,50 @@ def keyboard_events():
     text.pack(expand=True, fill=BOTH)
     root.mainloop()
 
-#keyboard_events()
\ No newline at end of file
+#keyboard_events()
+
+
+def run_demo(demo_number):
+    """Run a specific demo"""
+    demos = {
+        1: helloWorld,
+        2: helloImage,
+        3: multiPack,
+        4: non_functioning_calculator,
+        5: buttonIntro,
+        6: functioning_calculator,
+        7: date_compute,
+        8: keyboard_events
+    }
+    
+    if demo_number in demos:
+        demos[demo_number]()
+    else:
+        print(f"Demo {demo_number} not found!")
+
+
+def main():
+    """Main function to select and run demos"""
+    print("Week 4 GUI Demos")
+    print("================")
+    print("1. Hello World")
+    print("2. Hello Image")
+    print("3. Multiple Widgets with pack()")
+    print("4. Calculator Layout (labels only)")
+    print("5. Button Intro")
+    print("6. Functioning Calculator")
+    print("7. Date Compute")
+    print("8. Keyboard Events")
+    print()
+    
+    try:
+        choice = int(input("Enter demo number (1-8): "))
+        run_demo(choice)
+    except ValueError:
+        print("Invalid input. Please enter a number between 1 and 8.")
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+
+
+if __name__ == "__main__":
+    main()
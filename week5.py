@@ -1,7 +1,8 @@
-from tkinter import Tk, Label, PhotoImage, Button, Entry, Text, Frame
+from tkinter import Tk, Label, Button, Entry, Text, Frame
 from tkinter import BOTTOM, LEFT, RIGHT, RIDGE, RAISED, END, BOTH
 from time import strftime, localtime
 from tkinter.messagebox import showinfo
+# Nothing runs at import; run a demo with run_demo() or from the menu in main()
 def clicked():
     time = strftime('Day:  %d %b %Y\nTime: %H:%M:%S %p\n', localtime())
     showinfo(message = time)
@@ -64,8 +65,10 @@ class MultiPack:
                     pady=10,  
                     text='It\'s the most wonderful time of the year!')
         
-        self.halloween01 = PhotoImage(file='images/halloween01.png')
-        self.halloween02 = PhotoImage(file='images/halloween02.png')
+        # Decoded once and shared, however many windows show them
+        from gui_helpers import load_photo
+        self.halloween01 = load_photo(self.root, 'images/halloween01.png')
+        self.halloween02 = load_photo(self.root, 'images/halloween02.png')
 
         halloween01Label = Label(master=self.root,
                    borderwidth=15,  
@@ -104,5 +107,38 @@ class MultiPack:
     def run(self):
         self.root.mainloop()
 
-m = MultiPack()
-m.run()
\ No newline at end of file
+
+def run_demo(demo_number):
+    """Run a specific demo"""
+    demos = {
+        1: clickIt_noClass,
+        2: lambda: ClickBetter().run(),
+        3: lambda: MultiPack().run()
+    }
+    
+    if demo_number in demos:
+        demos[demo_number]()
+    else:
+        print(f"Demo {demo_number} not found!")
+
+
+def main():
+    """Main function to select and run demos"""
+    print("Week 5 GUI Demos")
+    print("================")
+    print("1. Click It (no class)")
+    print("2. Click It (class)")
+    print("3. Multiple Widgets with Add/Delete")
+    print()
+    
+    try:
+        choice = int(input("Enter demo number (1-3): "))
+        run_demo(choice)
+    except ValueError:
+        print("Invalid input. Please enter a number between 1 and 3.")
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+
+
+if __name__ == "__main__":
+    main()